@@ -0,0 +1,26 @@
+"""
+Gunicorn configuration for the sensor data API.
+
+Serves the Flask app with gevent workers so long-lived SSE connections
+(/api/stream) are green threads instead of OS threads.
+
+Usage:
+    gunicorn -c gunicorn_conf.py src.server.app:app
+
+Environment Variables:
+    PORT - Port to bind to (default: 5000)
+    WEB_CONCURRENCY - Number of worker processes (default: 4)
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "gevent"
+worker_connections = 1000
+
+
+def post_fork(server, worker):
+    """Make psycopg2 cooperative so DB waits yield to other greenlets."""
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
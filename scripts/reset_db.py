@@ -47,9 +47,12 @@ def reset_database():
             print(f"Found {count} records in sensor_db table")
             print()
 
-            # Truncate the table (fast delete that preserves structure)
+            # Truncate the table (fast delete that preserves structure). TRUNCATE is
+            # transactional in PostgreSQL, so if anything below fails the data is restored.
             print("Clearing all data...")
             conn.execute(text("TRUNCATE TABLE sensor_db"))
+
+            has_aggregate = conn.execute(text("SELECT to_regclass('sensor_5m')")).scalar()
             print("✓ All data cleared successfully!")
             print()
 
@@ -58,6 +61,13 @@ def reset_database():
             new_count = result.scalar()
             print(f"Records remaining: {new_count}")
 
+        # Clear the 5-minute rollups too, otherwise charts keep showing old buckets.
+        # Continuous aggregates can't be truncated directly; refreshing over the
+        # now-empty table does it, and must run outside a transaction.
+        if has_aggregate:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.execute(text("CALL refresh_continuous_aggregate('sensor_5m', NULL, NULL)"))
+
         print()
         print("=" * 60)
         print("Database reset complete!")
@@ -12,7 +12,9 @@ import random
 import time
 import os
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+import numpy as np
 
 from src.collector.storage import TimescaleStorage
 
@@ -28,10 +30,12 @@ TEST_NODES = [
 ]
 
 
-def generate_sensor_reading(node_id: str) -> Dict[str, Any]:
+def generate_sensor_reading(node_id: str, timestamp: Optional[datetime] = None) -> Dict[str, Any]:
     """
     Generate realistic fake sensor data matching the current database schema.
 
+    If timestamp is None, the reading is stamped with datetime.now().
+
     Schema fields:
     - node_id: VARCHAR(32)
     - timestamp: TIMESTAMP
@@ -61,7 +65,7 @@ def generate_sensor_reading(node_id: str) -> Dict[str, Any]:
     # Clamp values to realistic ranges
     reading = {
         "node_id": node_id,
-        "timestamp": datetime.now(),
+        "timestamp": timestamp if timestamp is not None else datetime.now(),
         "temperature": round(base_temp, 1),
         "relative_humidity": round(max(0, min(100, base_humidity)), 1),
         "soil_moisture": round(max(0, min(100, base_soil)), 1),
@@ -71,6 +75,47 @@ def generate_sensor_reading(node_id: str) -> Dict[str, Any]:
 
     return reading
 
+def generate_batch(node_ids: List[str], timestamps: List[datetime]) -> Dict[str, Any]:
+    """
+    Generate readings for every (timestamp, node) pair in one vectorized pass.
+
+    Uses the same ranges, correlations and clamping as generate_sensor_reading,
+    but draws all random values at once with NumPy.
+
+    Args:
+        node_ids: Node IDs to generate readings for
+        timestamps: Timestamps to generate readings at
+
+    Returns:
+        Dictionary of equal-length columns, ordered timestamp-major
+        (all nodes for the first timestamp, then the next, ...)
+    """
+    n_rows = len(timestamps) * len(node_ids)
+    rng = np.random.default_rng()
+
+    # Columns: temperature, humidity, soil moisture, lux, voltage
+    base = np.array([22.0, 50.0, 45.0, 5000.0, 3.7])
+    low = np.array([-3, -15, -20, -2000, -0.5])
+    high = np.array([8, 25, 30, 3000, 0.4])
+    values = base + rng.uniform(low, high, size=(n_rows, 5))
+    temp, humidity, soil, lux, voltage = values.T
+
+    # Add correlations for realism
+    humidity[temp > 27] -= 10
+    bright = lux > 7000
+    temp[bright] += 2
+    soil[bright] -= 5
+
+    return {
+        "node_id": np.tile(node_ids, len(timestamps)),
+        "timestamp": np.repeat(np.array(timestamps, dtype=object), len(node_ids)),
+        "temperature": np.round(temp, 1),
+        "relative_humidity": np.round(np.clip(humidity, 0, 100), 1),
+        "soil_moisture": np.round(np.clip(soil, 0, 100), 1),
+        "lux": np.round(np.maximum(lux, 0), 1),
+        "voltage": np.round(np.clip(voltage, 3.0, 4.2), 2),
+    }
+
 def generate_historical_data(storage: TimescaleStorage, hours: int = 24, interval_minutes: int = 5) -> None:
     """
     Generate historical data for the past N hours.
@@ -86,19 +131,19 @@ def generate_historical_data(storage: TimescaleStorage, hours: int = 24, interva
     current_time = start_time
     end_time = datetime.now()
 
-    count = 0
+    timestamps = []
     while current_time <= end_time:
-        for node_id in TEST_NODES:
-            reading = generate_sensor_reading(node_id)
-            reading["timestamp"] = current_time
-
-            storage.save(reading)
-            count += 1
+        timestamps.append(current_time)
+        current_time += timedelta(minutes=interval_minutes)
 
-            if count % 50 == 0:
-                print(f"Generated {count} readings...")
+    # Convert columns to native Python values only at the database boundary
+    batch = generate_batch(TEST_NODES, timestamps)
+    columns = list(batch.keys())
+    readings = [dict(zip(columns, row)) for row in zip(*(batch[col].tolist() for col in columns))]
 
-        current_time += timedelta(minutes=interval_minutes)
+    # Load everything with a single COPY
+    print(f"Loading {len(readings)} readings...")
+    count = storage.copy_load(readings)
 
     print(f"✅ Generated {count} total readings")
 
@@ -119,12 +164,22 @@ def generate_live_data(storage: TimescaleStorage, duration_seconds: int = 60, in
     count = 0
 
     while time.time() - start_time < duration_seconds:
-        for node_id in TEST_NODES:
-            reading = generate_sensor_reading(node_id)
-            storage.save(reading)
+        now = datetime.now()
+        readings = [generate_sensor_reading(node_id, now) for node_id in TEST_NODES]
+
+        # Write all nodes for this tick on one connection, in one transaction
+        try:
+            with storage.session() as conn:
+                for reading in readings:
+                    storage.save_on(conn, reading)
+        except Exception as e:
+            print(f"DB Save Error: {e}")
+            time.sleep(interval_seconds)
+            continue
+
+        for reading in readings:
             count += 1
-
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] {node_id}: "
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] {reading['node_id']}: "
                   f"Temp={reading['temperature']}°C, "
                   f"Humidity={reading['relative_humidity']:.1f}%, "
                   f"Soil={reading['soil_moisture']:.1f}%, "
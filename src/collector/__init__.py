@@ -5,11 +5,13 @@ Handles listening for packets, parsing telemetry, and storing to database.
 
 from .listener import MeshtasticListener
 from .storage import TimescaleStorage
+from .batching_writer import BatchingWriter
 from .data_packet import DataPacket, EnvironmentPacket, PowerPacket
 
 __all__ = [
     'MeshtasticListener',
     'TimescaleStorage',
+    'BatchingWriter',
     'DataPacket',
     'EnvironmentPacket',
     'PowerPacket',
@@ -0,0 +1,149 @@
+"""
+Batching writer for sensor readings.
+
+Buffers readings from the collector and writes them to TimescaleDB in
+batches, flushing when either enough rows are buffered or the oldest
+buffered row has waited long enough. The buffer is bounded: callers block
+while it is full, so a slow database pushes back on the collector instead
+of growing memory without limit. A batch that fails to write is put back
+at the front of the buffer and retried with exponential backoff.
+"""
+
+import logging
+import time
+from threading import Condition, Thread
+from typing import Any
+from .data_packet import DataPacket
+from .storage import TimescaleStorage
+
+logger = logging.getLogger(__name__)
+
+# Backoff between attempts to write a failed batch, doubling up to the max
+RETRY_INITIAL_SECONDS = 1
+RETRY_MAX_SECONDS = 30
+
+
+class BatchingWriter:
+    """Thread-safe buffer that flushes readings to storage in batches."""
+
+    def __init__(self, storage: TimescaleStorage, max_rows: int = 50, max_latency_ms: int = 1000,
+                 max_buffered_rows: int = 10_000):
+        """
+        Initialize the writer and start its flush thread.
+
+        Args:
+            storage: Storage the batches are written to.
+            max_rows: Flush as soon as this many readings are buffered.
+            max_latency_ms: Flush at most this long after the first buffered reading.
+            max_buffered_rows: save()/save_many() block while this many readings are buffered.
+        """
+        self.storage = storage
+        self.max_rows = max_rows
+        self.max_latency = max_latency_ms / 1000
+        self.max_buffered_rows = max(max_buffered_rows, max_rows)
+
+        self._buffer: list[dict[str, Any]] = []
+        self._condition = Condition()
+        self._closed = False
+
+        self._thread = Thread(target=self._run, name="BatchingWriter", daemon=True)
+        self._thread.start()
+
+    def save(self, data) -> None:
+        """
+        Queue a reading for the next batch.
+
+        Args:
+            data: Reading dict or DataPacket.
+        """
+        if isinstance(data, DataPacket):
+            data = data.to_dict()
+
+        with self._condition:
+            self._wait_for_room()
+
+            self._buffer.append(data)
+            # Wake the flush thread to start the latency timer, or flush a full batch
+            if len(self._buffer) == 1 or len(self._buffer) >= self.max_rows:
+                self._condition.notify_all()
+
+    def save_many(self, readings: list) -> None:
+        """
+        Queue several readings for the next batch in one lock acquisition.
+
+        Args:
+            readings: Reading dicts or DataPackets.
+        """
+        rows = [r.to_dict() if isinstance(r, DataPacket) else r for r in readings]
+        if not rows:
+            return
+
+        with self._condition:
+            self._wait_for_room()
+
+            was_empty = not self._buffer
+            self._buffer.extend(rows)
+            if was_empty or len(self._buffer) >= self.max_rows:
+                self._condition.notify_all()
+
+    def close(self) -> None:
+        """
+        Flush any buffered readings and stop the flush thread.
+
+        If the database is down, the buffer gets one last write attempt and
+        is discarded if that fails.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _wait_for_room(self) -> None:
+        """Block until the buffer has room (caller holds the condition)."""
+        while len(self._buffer) >= self.max_buffered_rows and not self._closed:
+            self._condition.wait()
+
+        if self._closed:
+            raise RuntimeError("BatchingWriter is closed")
+
+    def _run(self) -> None:
+        backoff = RETRY_INITIAL_SECONDS
+        while True:
+            with self._condition:
+                # Wait for the first reading of a batch
+                while not self._buffer and not self._closed:
+                    self._condition.wait()
+
+                # Give the batch up to max_latency to fill
+                deadline = time.monotonic() + self.max_latency
+                while len(self._buffer) < self.max_rows and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch, self._buffer = self._buffer, []
+                closed = self._closed
+                # Release callers blocked on a full buffer
+                self._condition.notify_all()
+
+            if batch:
+                try:
+                    count = self.storage.upsert_many(batch)
+                except Exception:
+                    if closed:
+                        logger.exception("Final write failed, discarding %d readings", len(batch))
+                        return
+                    logger.exception("Failed to write %d readings, retrying in %ss", len(batch), backoff)
+                    with self._condition:
+                        # Back at the front, so readings keep their order
+                        self._buffer[:0] = batch
+                        # close() cuts the wait short for one final attempt
+                        self._condition.wait_for(lambda: self._closed, timeout=backoff)
+                    backoff = min(backoff * 2, RETRY_MAX_SECONDS)
+                    continue
+                backoff = RETRY_INITIAL_SECONDS
+                logger.debug("Saved/Updated %d records (%d readings)", count, len(batch))
+
+            if closed:
+                return
@@ -1,10 +1,11 @@
+from dataclasses import dataclass
 from typing import Optional
 
 
+@dataclass(slots=True)
 class DataPacket:
-    def __init__(self, node_id: str, timestamp: str):
-        self.node_id = node_id
-        self.timestamp = timestamp
+    node_id: str
+    timestamp: str
 
     def to_dict(self) -> dict:
         """Returns base dictionary with common fields"""
@@ -14,22 +15,30 @@ class DataPacket:
         }
 
 
+@dataclass(slots=True)
 class EnvironmentPacket(DataPacket):
-    def __init__(self, telemetry_data: dict, node_id: str, timestamp: str):
-        super().__init__(node_id, timestamp)
-        self.temperature: Optional[float] = telemetry_data.get("temperature")
-        self.relative_humidity: Optional[float] = telemetry_data.get("relativeHumidity")
-        self.soil_moisture: Optional[float] = telemetry_data.get("soilMoisture")
-        self.lux: Optional[float] = telemetry_data.get("lux")
-
-    def __repr__(self):
-        return (f"EnvironmentPacket(node_id={self.node_id}, timestamp={self.timestamp}, "
-                f"temp={self.temperature}, humidity={self.relative_humidity}, "
-                f"soil moisture={self.soil_moisture}, lux={self.lux})")
+    temperature: Optional[float] = None
+    relative_humidity: Optional[float] = None
+    soil_moisture: Optional[float] = None
+    lux: Optional[float] = None
+
+    @classmethod
+    def from_telemetry(cls, telemetry_data: dict, node_id: str, timestamp: str) -> "EnvironmentPacket":
+        """Build a packet from Meshtastic's environmentMetrics dict."""
+        return cls(
+            node_id,
+            timestamp,
+            telemetry_data.get("temperature"),
+            telemetry_data.get("relativeHumidity"),
+            telemetry_data.get("soilMoisture"),
+            telemetry_data.get("lux"),
+        )
 
     def to_dict(self) -> dict:
+        # One literal instead of dataclasses.asdict (which deep-copies every field)
         return {
-            **super().to_dict(),
+            "node_id": self.node_id,
+            "timestamp": self.timestamp,
             "temperature": self.temperature,
             "relative_humidity": self.relative_humidity,
             "soil_moisture": self.soil_moisture,
@@ -37,17 +46,18 @@ class EnvironmentPacket(DataPacket):
         }
 
 
+@dataclass(slots=True)
 class PowerPacket(DataPacket):
-    def __init__(self, telemetry_data: dict, node_id: str, timestamp: str):
-        super().__init__(node_id, timestamp)
-        self.voltage: Optional[float] = telemetry_data.get("ch1Voltage")
+    voltage: Optional[float] = None
 
-    def __repr__(self):
-        return (f"PowerPacket(node_id={self.node_id}, timestamp={self.timestamp}, "
-                f"voltage={self.voltage})")
+    @classmethod
+    def from_telemetry(cls, telemetry_data: dict, node_id: str, timestamp: str) -> "PowerPacket":
+        """Build a packet from Meshtastic's powerMetrics dict."""
+        return cls(node_id, timestamp, telemetry_data.get("ch1Voltage"))
 
     def to_dict(self) -> dict:
         return {
-            **super().to_dict(),
+            "node_id": self.node_id,
+            "timestamp": self.timestamp,
             "voltage": self.voltage,
         }
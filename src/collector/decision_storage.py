@@ -4,12 +4,24 @@ Local file-based storage for decisions.
 Stores decisions as they are generated in a JSON file for later retrieval.
 """
 
-import json
+import logging
+import orjson
 import os
 from threading import Lock
 from typing import Any
 from pathlib import Path
 
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+def _equal_ignoring_timestamp(a: dict[str, Any], b: dict[str, Any]) -> bool:
+    """Compare two decisions field by field, ignoring 'timestamp', without copying either."""
+    if len(a) - ('timestamp' in a) != len(b) - ('timestamp' in b):
+        return False
+    return all(k == 'timestamp' or b.get(k, _MISSING) == v for k, v in a.items())
+
 
 class DecisionStorage:
     """Thread-safe local file storage for decisions."""
@@ -30,7 +42,14 @@ class DecisionStorage:
             self.file_path = Path(file_path)
 
         self._lock = Lock()
+
+        # In-memory copy of the file, keyed by "node_id_primary_metric".
+        # _mtime_ns is the file's mtime when the cache was last synced with it.
+        self._cache: dict[str, dict[str, Any]] = {}
+        self._mtime_ns: int | None = None
+
         self._ensure_file_exists()
+        self._load()
 
     def _ensure_file_exists(self):
         """Ensure the data directory and file exist."""
@@ -39,8 +58,46 @@ class DecisionStorage:
 
         # Create empty file if it doesn't exist (use dict format)
         if not self.file_path.exists():
-            with open(self.file_path, 'w') as f:
-                json.dump({}, f)
+            with open(self.file_path, 'wb') as f:
+                f.write(orjson.dumps({}))
+
+    def _load(self) -> None:
+        """Load the file into the in-memory cache (caller holds the lock or is __init__)."""
+        try:
+            with open(self.file_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            data = {}
+
+        # Handle legacy format (list) - convert to dict
+        if isinstance(data, list):
+            data = {
+                f"{d['node_id']}_{d.get('primary_metric', 'unknown')}": d
+                for d in data if 'node_id' in d
+            }
+
+        self._cache = data
+        self._mtime_ns = self._current_mtime_ns()
+
+    def _current_mtime_ns(self) -> int | None:
+        try:
+            return self.file_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _sync(self) -> None:
+        """Reload the cache if another process (e.g. the API's clear) changed the file."""
+        if self._current_mtime_ns() != self._mtime_ns:
+            self._load()
+
+    def _write(self) -> None:
+        """Write the cache to the file (caller holds the lock)."""
+        # Write a sibling temp file and swap it in, so a crash mid-write never
+        # leaves a truncated decisions file behind
+        tmp_path = self.file_path.with_suffix('.json.tmp')
+        tmp_path.write_bytes(orjson.dumps(self._cache, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, self.file_path)
+        self._mtime_ns = self._current_mtime_ns()
 
     def save_decision(self, decision_dict: dict[str, Any]) -> bool:
         """
@@ -62,55 +119,41 @@ class DecisionStorage:
                 primary_metric = decision_dict.get('primary_metric', 'unknown')
 
                 if not node_id:
-                    print("Error: Decision missing node_id")
+                    logger.error("Decision missing node_id")
                     return False
 
                 # Create composite key: node_id + primary_metric
                 decision_key = f"{node_id}_{primary_metric}"
 
-                # Read existing decisions (stored as dict with composite key)
-                with open(self.file_path, 'r') as f:
-                    try:
-                        decisions_dict = json.load(f)
-                        # Handle legacy format (list) - convert to dict
-                        if isinstance(decisions_dict, list):
-                            decisions_dict = {}
-                            for d in decisions_dict:
-                                if 'node_id' in d:
-                                    key = f"{d['node_id']}_{d.get('primary_metric', 'unknown')}"
-                                    decisions_dict[key] = d
-                    except json.JSONDecodeError:
-                        decisions_dict = {}
+                self._sync()
+                decisions_dict = self._cache
 
                 # Check if we already have a decision for this node+metric
                 if decision_key in decisions_dict:
                     existing = decisions_dict[decision_key]
 
                     # Compare decisions (excluding timestamp)
-                    new_without_timestamp = {k: v for k, v in decision_dict.items() if k != 'timestamp'}
-                    existing_without_timestamp = {k: v for k, v in existing.items() if k != 'timestamp'}
-
-                    if new_without_timestamp == existing_without_timestamp:
+                    if _equal_ignoring_timestamp(decision_dict, existing):
                         # Same decision - just update timestamp
                         existing['timestamp'] = decision_dict['timestamp']
-                        print(f"  → Updated timestamp for {node_id}/{primary_metric}: {existing['decision_text']}")
+                        # Most readings land here; DEBUG only, and formatted lazily
+                        logger.debug("  → Updated timestamp for %s/%s: %s", node_id, primary_metric, existing['decision_text'])
                     else:
                         # Different decision - replace it
                         decisions_dict[decision_key] = decision_dict
-                        print(f"  → Updated decision for {node_id}/{primary_metric}: {decision_dict['decision_text']}")
+                        logger.info("  → Updated decision for %s/%s: %s", node_id, primary_metric, decision_dict['decision_text'])
                 else:
                     # New node+metric - add it
                     decisions_dict[decision_key] = decision_dict
-                    print(f"  → New decision for {node_id}/{primary_metric}: {decision_dict['decision_text']}")
+                    logger.info("  → New decision for %s/%s: %s", node_id, primary_metric, decision_dict['decision_text'])
 
                 # Write back to file
-                with open(self.file_path, 'w') as f:
-                    json.dump(decisions_dict, f, indent=2)
+                self._write()
 
                 return True
 
-        except Exception as e:
-            print(f"Error saving decision: {e}")
+        except Exception:
+            logger.exception("Error saving decision")
             return False
 
     def get_all_decisions(self) -> list[dict[str, Any]]:
@@ -122,18 +165,10 @@ class DecisionStorage:
         """
         try:
             with self._lock:
-                with open(self.file_path, 'r') as f:
-                    try:
-                        data = json.load(f)
-                        # Handle both dict and legacy list formats
-                        if isinstance(data, dict):
-                            return list(data.values())
-                        else:
-                            return data
-                    except json.JSONDecodeError:
-                        return []
-        except Exception as e:
-            print(f"Error reading decisions: {e}")
+                self._sync()
+                return list(self._cache.values())
+        except Exception:
+            logger.exception("Error reading decisions")
             return []
 
     def clear_all(self) -> int:
@@ -145,25 +180,17 @@ class DecisionStorage:
         """
         try:
             with self._lock:
-                # Count existing decisions
-                with open(self.file_path, 'r') as f:
-                    try:
-                        data = json.load(f)
-                        if isinstance(data, dict):
-                            count = len(data)
-                        else:
-                            count = len(data)
-                    except json.JSONDecodeError:
-                        count = 0
+                self._sync()
+                count = len(self._cache)
 
                 # Clear the file (use dict format)
-                with open(self.file_path, 'w') as f:
-                    json.dump({}, f)
+                self._cache = {}
+                self._write()
 
                 return count
 
-        except Exception as e:
-            print(f"Error clearing decisions: {e}")
+        except Exception:
+            logger.exception("Error clearing decisions")
             return 0
 
     def get_count(self) -> int:
@@ -173,4 +200,11 @@ class DecisionStorage:
         Returns:
             Number of decisions in storage.
         """
-        return len(self.get_all_decisions())
+        # len() of the cache; no list copy of every decision just to count them
+        try:
+            with self._lock:
+                self._sync()
+                return len(self._cache)
+        except Exception:
+            logger.exception("Error reading decisions")
+            return 0
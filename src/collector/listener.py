@@ -1,57 +1,93 @@
 import meshtastic
 import meshtastic.serial_interface
 from pubsub import pub
+import logging
 import time
-from queue import Queue
+from queue import Queue, Full, Empty
 from typing import Optional, Any
 from .data_packet import DataPacket, EnvironmentPacket, PowerPacket
 
+# Upper bound on packets waiting for the collector; beyond this the oldest are dropped
+MAX_QUEUED_PACKETS = 10_000
+
+logger = logging.getLogger(__name__)
+
 
 class MeshtasticListener:
     def __init__(self):
-        self.queue: Queue[DataPacket] = Queue()
+        self.queue: Queue[DataPacket] = Queue(maxsize=MAX_QUEUED_PACKETS)
+        self.dropped_packets = 0
         self.interface: Optional[meshtastic.serial_interface.SerialInterface] = None
+        # (minute since epoch, formatted timestamp) - timestamps only change once a minute
+        self._ts_cache: tuple[int, str] = (-1, "")
+        # Telemetry key -> handler, checked in order (environment wins if both are present)
+        self._metric_handlers = {
+            "environmentMetrics": self._process_environment_metrics,
+            "powerMetrics": self._process_power_metrics,
+        }
 
     def _get_node_id(self, packet: dict[str, Any]) -> str:
         return packet.get("fromId", "unknown")
 
     def _get_timestamp(self) -> str:
-        return time.strftime('%Y-%m-%d %H:%M', time.localtime())
+        minute = int(time.time()) // 60
+        if minute != self._ts_cache[0]:
+            self._ts_cache = (minute, time.strftime('%Y-%m-%d %H:%M', time.localtime()))
+        return self._ts_cache[1]
+
+    def _enqueue(self, packet: DataPacket) -> None:
+        """Queue a packet, discarding the oldest one if the consumer has fallen behind."""
+        while True:
+            try:
+                self.queue.put_nowait(packet)
+                return
+            except Full:
+                try:
+                    self.queue.get_nowait()
+                except Empty:
+                    continue
+                self.dropped_packets += 1
+                if self.dropped_packets % 1000 == 1:
+                    logger.warning("Queue full, dropped %d packets so far", self.dropped_packets)
 
-    def _process_environment_metrics(self, packet: dict[str, Any], telemetry_data: dict[str, Any]) -> None:
-        env_metrics = telemetry_data["environmentMetrics"]
-        environment_packet = EnvironmentPacket(
+    def _process_environment_metrics(self, packet: dict[str, Any], env_metrics: dict[str, Any]) -> None:
+        environment_packet = EnvironmentPacket.from_telemetry(
             env_metrics,
             self._get_node_id(packet),
             self._get_timestamp()
         )
-        self.queue.put(environment_packet)
+        self._enqueue(environment_packet)
 
-    def _process_power_metrics(self, packet: dict[str, Any], telemetry_data: dict[str, Any]) -> None:
-        pow_metrics = telemetry_data["powerMetrics"]
-        power_packet = PowerPacket(
+    def _process_power_metrics(self, packet: dict[str, Any], pow_metrics: dict[str, Any]) -> None:
+        power_packet = PowerPacket.from_telemetry(
             pow_metrics,
             self._get_node_id(packet),
             self._get_timestamp()
         )
-        self.queue.put(power_packet)
+        self._enqueue(power_packet)
 
     def _on_receive(self, packet: dict[str, Any], interface) -> None:
         try:
-            decoded = packet.get("decoded", {})
-            if "telemetry" not in decoded:
+            decoded = packet.get("decoded")
+            if not decoded:
+                return
+
+            telemetry_data = decoded.get("telemetry")
+            if telemetry_data is None:
                 return
 
-            telemetry_data = decoded["telemetry"]
-            print(f"Received Telemetry Data: {telemetry_data}")
+            # Lazy %-formatting: the dict is only rendered when DEBUG is enabled
+            logger.debug("Received Telemetry Data: %s", telemetry_data)
 
-            if "environmentMetrics" in telemetry_data:
-                self._process_environment_metrics(packet, telemetry_data)
-            elif "powerMetrics" in telemetry_data:
-                self._process_power_metrics(packet, telemetry_data)
+            # One lookup per metric kind; the handler gets the metrics dict directly
+            for kind, handler in self._metric_handlers.items():
+                metrics = telemetry_data.get(kind)
+                if metrics is not None:
+                    handler(packet, metrics)
+                    break
 
-        except Exception as e:
-            print(f"Error handling packet: {e}")
+        except Exception:
+            logger.exception("Error handling packet")
 
     def start(self) -> Queue[DataPacket]:
         self.interface = meshtastic.serial_interface.SerialInterface()
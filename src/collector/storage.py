@@ -1,60 +1,481 @@
+import io
+import logging
+import math
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
+from datetime import datetime
+from typing import Optional
+import psycopg2
 from sqlalchemy import create_engine, text
+from psycopg2.extras import execute_values
 from .data_packet import DataPacket
 
+logger = logging.getLogger(__name__)
+
+
+# Column order used by the bulk insert paths
+SENSOR_COLUMNS = (
+    "node_id",
+    "timestamp",
+    "temperature",
+    "relative_humidity",
+    "soil_moisture",
+    "lux",
+    "voltage",
+)
+
+# Batches at least this large are upserted through a COPY'd staging table
+COPY_THRESHOLD = 1000
+
+# Sensor value columns (everything but the (node_id, timestamp) key)
+VALUE_COLUMNS = SENSOR_COLUMNS[2:]
+
+# Matches sensor_db.node_id VARCHAR(32)
+MAX_NODE_ID_LENGTH = 32
+
+# Physically plausible (min, max) per value column; anything outside is a
+# corrupted packet rather than a reading
+VALUE_RANGES = {
+    "temperature": (-80.0, 125.0),
+    "relative_humidity": (0.0, 100.0),
+    "soil_moisture": (0.0, 100.0),
+    "lux": (0.0, 200_000.0),
+    "voltage": (0.0, 60.0),
+}
+
+# Timestamp format produced by the listener
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+# Time span of each hypertable chunk. Sized so the newest chunk and its
+# indexes stay in memory; only affects chunks created after a change.
+CHUNK_TIME_INTERVAL = os.getenv("CHUNK_TIME_INTERVAL", "1 day")
+
+
+# Characters with a meaning in text-format COPY, escaped in string values
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _format_value_for_copy(value) -> str:
+    """Format a single value for PostgreSQL's text COPY format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    return str(value)
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    """Parse a reading timestamp into a naive datetime, or None if it isn't one."""
+    if isinstance(value, datetime):
+        # sensor_db.timestamp is local time without a zone, like the listener's
+        return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
+    except ValueError:
+        pass
+    try:
+        return _parse_timestamp(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+def _validated_timestamp(reading: dict) -> Optional[datetime]:
+    """
+    Check a reading can be inserted without a SQL error.
+
+    One bad row makes the whole batch statement fail and roll back, so the
+    batch paths drop such rows up front instead. NaN, infinities and values
+    outside VALUE_RANGES are rejected too; they are corrupt packets that
+    would otherwise poison the aggregates.
+
+    Returns:
+        The reading's timestamp as a naive datetime, or None if the
+        reading is invalid.
+    """
+    node_id = reading.get("node_id")
+    if not isinstance(node_id, str) or not node_id or len(node_id) > MAX_NODE_ID_LENGTH:
+        return None
+    timestamp = _parse_timestamp(reading.get("timestamp"))
+    if timestamp is None:
+        return None
+    for col in VALUE_COLUMNS:
+        value = reading.get(col)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            return None
+        low, high = VALUE_RANGES[col]
+        if not low <= value <= high:
+            return None
+    return timestamp
+
+
+@lru_cache(maxsize=16)
+def _upsert_query(columns: tuple[str, ...]):
+    """
+    Build the single-row UPSERT for a reading with the given columns.
+
+    Readings only come in a few shapes (environment, power), so the
+    statement text is built once per shape rather than once per save.
+    """
+    columns_str = ', '.join(columns)
+    placeholders = ', '.join([f':{col}' for col in columns])
+
+    # Build UPDATE clause for fields that have data (excluding node_id and timestamp)
+    update_fields = [col for col in columns if col not in ['node_id', 'timestamp']]
+
+    if update_fields:
+        update_clause = ', '.join([f"{field} = EXCLUDED.{field}" for field in update_fields])
+        stored = ', '.join([f"sensor_db.{field}" for field in update_fields])
+        incoming = ', '.join([f"EXCLUDED.{field}" for field in update_fields])
+        # Skip the write entirely when a retransmitted packet changes nothing
+        conflict_action = f"DO UPDATE SET {update_clause} WHERE ({stored}) IS DISTINCT FROM ({incoming})"
+    else:
+        # Only node_id and timestamp - nothing to update
+        conflict_action = "DO NOTHING"
+
+    # UPSERT query
+    return text(f"""
+        INSERT INTO sensor_db ({columns_str})
+        VALUES ({placeholders})
+        ON CONFLICT (node_id, timestamp)
+        {conflict_action}
+    """)
+
 
 class TimescaleStorage:
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, pool_size: int = 2, max_overflow: int = 6):
+        """
+        Initialize storage backed by a pooled SQLAlchemy engine.
+
+        Args:
+            db_url: PostgreSQL connection URL.
+            pool_size: Connections kept open in the engine's pool.
+            max_overflow: Extra connections opened under load (closed when returned).
+        """
         self.db_url = db_url
-        self.engine = create_engine(db_url, pool_pre_ping=True)
+        # Every write path (including raw_connection() for execute_values/COPY)
+        # checks out from this pool and returns the connection rolled back
+        self.engine = create_engine(db_url, pool_pre_ping=True, pool_size=pool_size, max_overflow=max_overflow)
 
     def init_db(self):
         with self.engine.begin() as conn:
             conn.execute(text("""
                 CREATE TABLE IF NOT EXISTS sensor_db (
-                    id SERIAL,
-                    node_id VARCHAR(32),
+                    node_id VARCHAR(32) NOT NULL,
                     timestamp TIMESTAMP NOT NULL,
                     temperature FLOAT,
                     relative_humidity FLOAT,
                     soil_moisture FLOAT,
                     lux FLOAT,
                     voltage FLOAT,
-                    UNIQUE (node_id, timestamp)
+                    PRIMARY KEY (node_id, timestamp)
                 );
             """))
-            conn.execute(text("SELECT create_hypertable('sensor_db', 'timestamp', if_not_exists => TRUE);"))
-        print("DB initialized.")
+            conn.execute(
+                text("""
+                    SELECT create_hypertable('sensor_db', 'timestamp',
+                        chunk_time_interval => CAST(:chunk_interval AS INTERVAL),
+                        if_not_exists => TRUE);
+                """),
+                {"chunk_interval": CHUNK_TIME_INTERVAL},
+            )
+            # create_hypertable is a no-op on existing tables, so apply the interval explicitly too
+            conn.execute(
+                text("SELECT set_chunk_time_interval('sensor_db', CAST(:chunk_interval AS INTERVAL));"),
+                {"chunk_interval": CHUNK_TIME_INTERVAL},
+            )
+            # Older schemas carried an unused SERIAL id column
+            conn.execute(text("ALTER TABLE sensor_db DROP COLUMN IF EXISTS id;"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS sensor_db_node_ts_idx ON sensor_db (node_id, timestamp DESC);"))
+
+            # Columnar compression for chunks older than a week (only configured once,
+            # since compression settings can't change while compressed chunks exist)
+            compression_enabled = conn.execute(text("""
+                SELECT compression_enabled FROM timescaledb_information.hypertables
+                WHERE hypertable_name = 'sensor_db'
+            """)).scalar()
+            if not compression_enabled:
+                conn.execute(text("""
+                    ALTER TABLE sensor_db SET (
+                        timescaledb.compress,
+                        timescaledb.compress_segmentby = 'node_id',
+                        timescaledb.compress_orderby = 'timestamp DESC'
+                    );
+                """))
+            conn.execute(text("SELECT add_compression_policy('sensor_db', INTERVAL '7 days', if_not_exists => TRUE);"))
 
-    def save(self, data):
+            # Push every inserted/updated reading to LISTENers (used by the SSE stream)
+            conn.execute(text("""
+                CREATE OR REPLACE FUNCTION notify_sensor_insert() RETURNS trigger AS $$
+                BEGIN
+                    PERFORM pg_notify('sensor_insert', json_build_object(
+                        'node_id', NEW.node_id,
+                        'timestamp', NEW.timestamp,
+                        'temperature', NEW.temperature,
+                        'relative_humidity', NEW.relative_humidity,
+                        'soil_moisture', NEW.soil_moisture,
+                        'lux', NEW.lux,
+                        'voltage', NEW.voltage
+                    )::text);
+                    RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+            conn.execute(text("DROP TRIGGER IF EXISTS sensor_db_notify ON sensor_db;"))
+            conn.execute(text("""
+                CREATE TRIGGER sensor_db_notify
+                AFTER INSERT OR UPDATE ON sensor_db
+                FOR EACH ROW EXECUTE FUNCTION notify_sensor_insert();
+            """))
+
+        # 5-minute rollups for /api/timeseries. Created outside a transaction
+        # so existing rows are materialized immediately (WITH DATA).
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("""
+                CREATE MATERIALIZED VIEW IF NOT EXISTS sensor_5m
+                WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+                SELECT
+                    time_bucket('5 minutes', timestamp) AS bucket,
+                    node_id,
+                    AVG(temperature) AS avg_temp,
+                    AVG(relative_humidity) AS avg_humidity,
+                    AVG(soil_moisture) AS avg_soil_moisture,
+                    AVG(lux) AS avg_lux,
+                    AVG(voltage) AS avg_voltage,
+                    MAX(temperature) AS max_temp,
+                    MIN(temperature) AS min_temp
+                FROM sensor_db
+                GROUP BY bucket, node_id
+                WITH DATA;
+            """))
+            conn.execute(text("""
+                SELECT add_continuous_aggregate_policy('sensor_5m',
+                    start_offset => INTERVAL '1 day',
+                    end_offset => INTERVAL '1 minute',
+                    schedule_interval => INTERVAL '1 minute',
+                    if_not_exists => TRUE);
+            """))
+        logger.info("DB initialized.")
+
+    @contextmanager
+    def session(self):
+        """
+        Yield one connection wrapped in a single transaction.
+
+        Use with save_on() to write several readings without checking out a
+        connection and committing per reading. Commits on exit, rolls back
+        if the block raises.
+        """
+        with self.engine.begin() as conn:
+            yield conn
+
+    def save_on(self, conn, data):
+        """
+        Upsert a single reading on an existing connection (see session()).
+
+        This does not commit or swallow errors; the caller's transaction
+        decides both.
+        """
+        if isinstance(data, DataPacket):
+            data = data.to_dict()
+
+        conn.execute(_upsert_query(tuple(data)), data)
+
+    def upsert_many(self, readings: list, page_size: int = 500) -> int:
+        """
+        Upsert many (possibly partial) readings with execute_values.
+
+        Environment and power packets for the same node and minute arrive
+        separately; readings sharing a (node_id, timestamp) are merged here
+        (a row can't be updated twice by one statement), and on conflict
+        only non-null values overwrite what is already stored. Batches of
+        COPY_THRESHOLD rows or more are sent with COPY instead.
+
+        Args:
+            readings: Reading dicts or DataPacket objects.
+            page_size: Number of rows per INSERT statement.
+
+        If COPY fails on bad data the batch falls back to execute_values,
+        and if that fails too the rows are retried one at a time under a
+        savepoint so only the offending rows are lost.
+
+        Returns:
+            Number of rows written to the database (0 if every reading was
+            malformed).
+
+        Raises:
+            Exception: The database couldn't be reached or the write failed
+                outright; nothing was committed and the caller may retry.
+        """
+        merged: dict[tuple, dict] = {}
+        invalid = 0
+        for reading in readings:
+            if isinstance(reading, DataPacket):
+                reading = reading.to_dict()
+            timestamp = _validated_timestamp(reading)
+            if timestamp is None:
+                invalid += 1
+                continue
+            # Keyed on the parsed time, so "10:00" and datetime(..., 10, 0) merge
+            key = (reading["node_id"], timestamp)
+            row = merged.get(key)
+            if row is None:
+                row = merged[key] = dict.fromkeys(SENSOR_COLUMNS)
+                row["node_id"], row["timestamp"] = key
+            for col in VALUE_COLUMNS:
+                value = reading.get(col)
+                if value is not None:
+                    row[col] = value
+
+        if invalid:
+            logger.warning("Dropped %d malformed readings", invalid)
+        if not merged:
+            return 0
+
+        merged_values = [f"COALESCE(EXCLUDED.{col}, sensor_db.{col})" for col in VALUE_COLUMNS]
+        update_clause = ', '.join(f"{col} = {value}" for col, value in zip(VALUE_COLUMNS, merged_values))
+        stored = ', '.join(f"sensor_db.{col}" for col in VALUE_COLUMNS)
+
+        # The WHERE makes retransmitted packets a no-op instead of a row rewrite
+        conflict_action = f"""
+            ON CONFLICT (node_id, timestamp) DO UPDATE SET {update_clause}
+            WHERE ({stored}) IS DISTINCT FROM ({', '.join(merged_values)})
+        """
+
+        raw_conn = self.engine.raw_connection()
         try:
-            if isinstance(data, DataPacket):
-                data = data.to_dict()
+            cursor = raw_conn.cursor()
+            # Oldest first, so the insert stays in the newest hypertable chunk(s)
+            ordered = sorted(merged.values(), key=itemgetter("timestamp"))
+            rows = [tuple(row[col] for col in SENSOR_COLUMNS) for row in ordered]
+            query = f"INSERT INTO sensor_db ({', '.join(SENSOR_COLUMNS)}) VALUES %s {conflict_action}"
+            written = len(rows)
+            copied = False
+            if len(rows) >= COPY_THRESHOLD:
+                try:
+                    self._copy_through_stage(cursor, rows, conflict_action)
+                    copied = True
+                except psycopg2.OperationalError:
+                    raise
+                except psycopg2.DatabaseError:
+                    raw_conn.rollback()
+                    logger.warning("COPY failed, falling back to execute_values", exc_info=True)
+            if not copied:
+                try:
+                    execute_values(cursor, query, rows, page_size=page_size)
+                except psycopg2.OperationalError:
+                    raise
+                except psycopg2.DatabaseError:
+                    raw_conn.rollback()
+                    logger.warning("Batch insert failed, retrying row by row", exc_info=True)
+                    written = self._insert_rows_individually(cursor, query, rows)
+            cursor.close()
+            raw_conn.commit()
+            return written
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
 
-            # Get column names and create placeholders
-            columns = list(data.keys())
-            columns_str = ', '.join(columns)
-            placeholders = ', '.join([f':{col}' for col in columns])
+    @staticmethod
+    def _insert_rows_individually(cursor, query: str, rows: list[tuple]) -> int:
+        """
+        Insert rows one by one, each under a savepoint, skipping rows that fail.
 
-            # Build UPDATE clause for fields that have data (excluding node_id and timestamp)
-            update_fields = [col for col in columns if col not in ['node_id', 'timestamp']]
-            update_clause = ', '.join([f"{field} = EXCLUDED.{field}" for field in update_fields])
+        A failed statement aborts the whole transaction; rolling back to the
+        row's savepoint discards just that row and keeps the rest.
 
-            # If no fields to update (only node_id and timestamp), just update timestamp
-            if not update_clause:
-                update_clause = "timestamp = EXCLUDED.timestamp"
+        Returns:
+            Number of rows inserted.
+        """
+        written = 0
+        for row in rows:
+            cursor.execute("SAVEPOINT sensor_row")
+            try:
+                execute_values(cursor, query, [row])
+            except psycopg2.OperationalError:
+                raise
+            except psycopg2.DatabaseError as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT sensor_row")
+                logger.warning("Dropped reading from %s at %s: %s", row[0], row[1], e)
+                continue
+            cursor.execute("RELEASE SAVEPOINT sensor_row")
+            written += 1
+        return written
 
-            # UPSERT query
-            query = text(f"""
-                INSERT INTO sensor_db ({columns_str})
-                VALUES ({placeholders})
-                ON CONFLICT (node_id, timestamp)
-                DO UPDATE SET {update_clause}
-            """)
+    def _copy_through_stage(self, cursor, rows: list[tuple], conflict_action: str) -> None:
+        """
+        COPY rows into a transaction-scoped staging table, then insert them.
 
-            with self.engine.begin() as conn:
-                conn.execute(query, data)
+        COPY can't resolve conflicts itself, so the rows (tuples in
+        SENSOR_COLUMNS order) are staged first and moved with a single
+        INSERT ... SELECT carrying the caller's ON CONFLICT clause, the same
+        one its execute_values path uses. Rows are inserted in timestamp
+        order so the insert walks the hypertable's chunks sequentially.
+        """
+        columns = ', '.join(SENSOR_COLUMNS)
 
-            print(f"Saved/Updated record for {data.get('node_id')} at {data.get('timestamp')}")
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_format_value_for_copy(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
 
-        except Exception as e:
-            print(f"DB Save Error: {e}")
+        cursor.execute("""
+            CREATE TEMP TABLE sensor_db_stage
+            (LIKE sensor_db INCLUDING DEFAULTS) ON COMMIT DROP
+        """)
+        cursor.copy_expert(f"COPY sensor_db_stage ({columns}) FROM STDIN", buffer)
+        cursor.execute(f"""
+            INSERT INTO sensor_db ({columns})
+            SELECT {columns} FROM sensor_db_stage
+            ORDER BY timestamp
+            {conflict_action}
+        """)
+
+    def copy_load(self, readings: list) -> int:
+        """
+        Bulk load complete readings using COPY FROM STDIN.
+
+        Much faster than INSERT for large one-off loads such as seeding
+        historical data. Rows go through the same staging table as
+        upsert_many's COPY path, so readings that already exist for a
+        (node_id, timestamp) are skipped instead of failing the whole load
+        (e.g. when re-running the generator over an overlapping range).
+
+        Args:
+            readings: Reading dicts or DataPacket objects.
+
+        Returns:
+            Number of rows sent to the database (0 on error).
+        """
+        if not readings:
+            return 0
+
+        rows = []
+        for reading in readings:
+            if isinstance(reading, DataPacket):
+                reading = reading.to_dict()
+            rows.append(tuple(reading.get(col) for col in SENSOR_COLUMNS))
+
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            self._copy_through_stage(cursor, rows, "ON CONFLICT (node_id, timestamp) DO NOTHING")
+            cursor.close()
+            raw_conn.commit()
+            return len(rows)
+        except Exception:
+            raw_conn.rollback()
+            logger.exception("DB copy failed")
+            return 0
+        finally:
+            raw_conn.close()
@@ -1,4 +1,4 @@
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Optional, Any
 from datetime import datetime
 from enum import Enum
@@ -28,7 +28,20 @@ class ActionType(Enum):
     NONE = "none"
 
 
-@dataclass
+# Value -> member maps; a dict lookup is much cheaper than Enum(value)
+_ACTION_BY_VALUE = {member.value: member for member in ActionType}
+_SEVERITY_BY_VALUE = {member.value: member for member in Severity}
+
+# Base priority per severity (see Decision.get_priority)
+_SEVERITY_PRIORITY = {
+    Severity.CRITICAL: 100,
+    Severity.WARNING: 50,
+    Severity.INFO: 10,
+    Severity.NORMAL: 0
+}
+
+
+@dataclass(slots=True)
 class Decision:
 
     # Core decision fields
@@ -56,36 +69,39 @@ class Decision:
     def __post_init__(self):
         # Convert string enums to Enum objects if passed as strings
         if isinstance(self.action, str):
-            self.action = ActionType(self.action)
+            self.action = _ACTION_BY_VALUE.get(self.action) or ActionType(self.action)
         if isinstance(self.severity, str):
-            self.severity = Severity(self.severity)
+            self.severity = _SEVERITY_BY_VALUE.get(self.severity) or Severity(self.severity)
 
         # Validate confidence is between 0 and 1
         if not 0 <= self.confidence <= 1:
             raise ValueError(f"Confidence must be between 0 and 1, got {self.confidence}")
 
     def to_dict(self) -> dict[str, Any]:
-        result = asdict(self)
-
-        # Convert enums to their string values
-        result['action'] = self.action.value
-        result['severity'] = self.severity.value
-
-        return result
+        # Built by hand rather than with asdict(), which introspects the fields and
+        # deep-copies context/metrics on every call. Those two are shared with the
+        # Decision, not copied; nothing mutates them after construction.
+        return {
+            'node_id': self.node_id,
+            'timestamp': self.timestamp,
+            'decision_text': self.decision_text,
+            'action': self.action.value,
+            'severity': self.severity.value,
+            'confidence': self.confidence,
+            'primary_metric': self.primary_metric,
+            'primary_value': self.primary_value,
+            'threshold_crossed': self.threshold_crossed,
+            'context': self.context,
+            'metrics': self.metrics,
+            'model_type': self.model_type,
+        }
 
     def is_actionable(self) -> bool:
         return self.action != ActionType.NONE and self.severity in [Severity.CRITICAL, Severity.WARNING]
 
     def get_priority(self) -> int:
-        severity_priority = {
-            Severity.CRITICAL: 100,
-            Severity.WARNING: 50,
-            Severity.INFO: 10,
-            Severity.NORMAL: 0
-        }
-
         # Base priority on severity, adjust by confidence
-        base = severity_priority.get(self.severity, 0)
+        base = _SEVERITY_PRIORITY.get(self.severity, 0)
         return int(base * self.confidence)
 
     def __str__(self) -> str:
@@ -10,7 +10,11 @@ Weather integration prevents unnecessary watering when rain is forecast.
 """
 
 from typing import Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+import math
 import sys
+import time
+from threading import Lock
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -21,6 +25,26 @@ from .decision import Decision, Severity, ActionType
 from .weather_service import WeatherService
 from utils.node_config import get_node_location
 
+# Sensor metrics copied into every Decision's "metrics" field
+_METRIC_KEYS = ("soil_moisture", "temperature", "relative_humidity", "voltage", "lux")
+
+# Base decisions per threshold crossed: (text, action, severity, confidence, threshold)
+_WATER_CRITICAL = ("Critical: Soil moisture extremely low", ActionType.WATER_IMMEDIATELY, Severity.CRITICAL, 0.95, "critical_low")
+_WATER_LOW = ("Low soil moisture detected", ActionType.WATER_NEEDED, Severity.WARNING, 0.85, "low")
+_WATER_HIGH = ("Soil moisture high - reduce watering", ActionType.REDUCE_WATERING, Severity.WARNING, 0.80, "high")
+_CHARGE_CRITICAL = ("Critical: Battery voltage critically low", ActionType.CHARGE_BATTERY_URGENT, Severity.CRITICAL, 0.98, "critical_low")
+_CHARGE_LOW = ("Low battery voltage", ActionType.CHARGE_BATTERY, Severity.WARNING, 0.90, "low")
+
+# Actions that mean "water now"; environmental factors only escalate these
+_WATERING_ACTIONS = frozenset({ActionType.WATER_IMMEDIATELY, ActionType.WATER_NEEDED})
+
+
+# How long a node's weather verdict is reused before asking WeatherService again
+WEATHER_TTL_SECONDS = 300
+
+# Upper bound on concurrent weather lookups when prefetching for a batch
+WEATHER_PREFETCH_WORKERS = 8
+
 
 class ThresholdModel(BaseDecisionModel):
     """
@@ -31,6 +55,10 @@ class ThresholdModel(BaseDecisionModel):
     urgency and confidence of actionable decisions (watering, charging).
     """
 
+    # See _get_weather_service
+    _shared_weather_service: Optional[WeatherService] = None
+    _weather_service_lock = Lock()
+
     def __init__(self, config: Optional[dict[str, Any]] = None, enable_weather: bool = True):
         """
         Initialize the threshold model with optional configuration.
@@ -42,19 +70,35 @@ class ThresholdModel(BaseDecisionModel):
         super().__init__(config)
         if not self.config:
             self.config = self._get_default_config()
+        self._rebuild_cache()
 
         # Initialize weather service if enabled
         self.weather_enabled = enable_weather
         self.weather_service = None
+        # node_id -> (fetched_at, (should_skip, skip_reason, confidence_multiplier, adjustment_reason))
+        self._weather_cache: dict[str, tuple[float, tuple[bool, Optional[str], float, Optional[str]]]] = {}
         if self.weather_enabled:
             try:
-                self.weather_service = WeatherService()
+                self.weather_service = self._get_weather_service()
                 print("[INFO] Weather service initialized")
             except Exception as e:
                 print(f"[WARNING] Failed to initialize weather service: {e}")
                 print("[INFO] Continuing without weather integration")
                 self.weather_enabled = False
 
+    @classmethod
+    def _get_weather_service(cls) -> WeatherService:
+        """
+        Get the WeatherService shared by all ThresholdModel instances.
+
+        Built on first use, so every model shares one config load and one
+        forecast cache; a failed construction is retried by the next model.
+        """
+        with cls._weather_service_lock:
+            if cls._shared_weather_service is None:
+                cls._shared_weather_service = WeatherService()
+            return cls._shared_weather_service
+
     def _get_default_config(self) -> dict[str, Any]:
         """Get default threshold configuration."""
         return {
@@ -90,6 +134,48 @@ class ThresholdModel(BaseDecisionModel):
             }
         }
 
+    def _rebuild_cache(self) -> None:
+        """
+        Flatten the threshold config into tuples read by the analyzers.
+
+        Saves a nested dict lookup per threshold per reading; must be rerun
+        whenever self.config changes (see update_config).
+        """
+        def thresholds(metric: str, *names: str) -> tuple:
+            values = self.config.get(metric, {})
+            return tuple(values.get(name) for name in names)
+
+        self._soil_t = thresholds("soil_moisture", "critical_low", "low", "optimal_min", "optimal_max", "high")
+        self._volt_t = thresholds("voltage", "critical_low", "low", "optimal_min", "optimal_max")
+        self._temp_t = thresholds("temperature", "cold", "optimal", "hot", "very_hot")
+        self._hum_t = thresholds("relative_humidity", "dry", "optimal", "humid")
+        self._lux_t = thresholds("lux", "dark", "low_light", "moderate", "bright")
+
+        # Ranges in which the ladders above find nothing, for a single-compare
+        # exit on the common healthy reading. max() keeps them exact even if
+        # critical_low is configured above low; a missing threshold gives an
+        # empty range so the full ladder runs (and fails) as before.
+        soil_critical, soil_low, _, _, soil_high = self._soil_t
+        volt_critical, volt_low, _, _ = self._volt_t
+        if None in (soil_critical, soil_low, soil_high):
+            self._soil_ok = (math.inf, -math.inf)
+        else:
+            self._soil_ok = (max(soil_critical, soil_low), soil_high)
+        if None in (volt_critical, volt_low):
+            self._volt_ok_min = math.inf
+        else:
+            self._volt_ok_min = max(volt_critical, volt_low)
+
+    def update_config(self, new_config: dict[str, Any]) -> None:
+        """
+        Update the model configuration and refresh the cached thresholds.
+
+        Args:
+            new_config: New configuration to merge with existing config.
+        """
+        super().update_config(new_config)
+        self._rebuild_cache()
+
     def analyze(self, reading: dict[str, Any]) -> list[Decision]:
         """
         Analyze a single sensor reading and produce decisions.
@@ -103,53 +189,145 @@ class ThresholdModel(BaseDecisionModel):
         Returns:
             List of Decision objects (one per primary_metric).
         """
+        # Read each metric once; the sub-analyzers get plain values
+        node_id = reading.get("node_id", "unknown")
+        timestamp = reading.get("timestamp", "")
+        soil_moisture = reading.get("soil_moisture")
+        temp = reading.get("temperature")
+        humidity = reading.get("relative_humidity")
+        voltage = reading.get("voltage")
+        lux = reading.get("lux")
+        metrics = dict(zip(_METRIC_KEYS, (soil_moisture, temp, humidity, voltage, lux)))
+
         decisions = []
 
         # Generate watering decision if we have soil_moisture data
-        soil_moisture = reading.get("soil_moisture")
         if soil_moisture is not None:
-            watering_decision = self._analyze_watering(reading)
+            watering_decision = self._analyze_watering(node_id, timestamp, soil_moisture, temp, humidity, lux, metrics)
             if watering_decision:
                 decisions.append(watering_decision)
             else:
                 # No watering issues - add normal watering status
                 decisions.append(Decision(
-                    node_id=reading.get("node_id", "unknown"),
-                    timestamp=reading.get("timestamp", ""),
+                    node_id=node_id,
+                    timestamp=timestamp,
                     decision_text="Soil moisture levels normal",
                     action=ActionType.NONE,
                     severity=Severity.NORMAL,
                     confidence=0.95,
                     primary_metric="soil_moisture",
                     primary_value=soil_moisture,
-                    metrics=self._extract_metrics(reading),
+                    metrics=metrics,
                     model_type=self.model_type
                 ))
 
         # Generate charging decision if we have voltage data
-        voltage = reading.get("voltage")
         if voltage is not None:
-            charging_decision = self._analyze_charging(reading)
+            charging_decision = self._analyze_charging(node_id, timestamp, voltage, lux, metrics)
             if charging_decision:
                 decisions.append(charging_decision)
             else:
                 # No charging issues - add normal voltage status
                 decisions.append(Decision(
-                    node_id=reading.get("node_id", "unknown"),
-                    timestamp=reading.get("timestamp", ""),
+                    node_id=node_id,
+                    timestamp=timestamp,
                     decision_text="Battery voltage normal",
                     action=ActionType.NONE,
                     severity=Severity.NORMAL,
                     confidence=0.95,
                     primary_metric="voltage",
                     primary_value=voltage,
-                    metrics=self._extract_metrics(reading),
+                    metrics=metrics,
                     model_type=self.model_type
                 ))
 
         return decisions
 
-    def _analyze_watering(self, reading: dict[str, Any]) -> Optional[Decision]:
+    def analyze_batch(self, readings: list[dict[str, Any]]) -> list[list[Decision]]:
+        """
+        Analyze multiple sensor readings, fetching their weather up front.
+
+        Args:
+            readings: List of sensor reading dictionaries.
+
+        Returns:
+            One list of Decision objects per reading (see analyze).
+        """
+        self.prefetch_weather(readings)
+        return [self.analyze(reading) for reading in readings]
+
+    def prefetch_weather(self, readings: list[dict[str, Any]]) -> None:
+        """
+        Fill the weather cache for every node in a batch that will need it.
+
+        Only readings whose soil moisture crosses a threshold consult the
+        weather. Fetching their nodes concurrently means a batch waits for
+        the slowest forecast instead of the sum of all of them; analyze()
+        then finds the verdicts cached.
+
+        Args:
+            readings: Sensor reading dictionaries about to be analyzed.
+        """
+        if not (self.weather_enabled and self.weather_service):
+            return
+
+        ok_min, ok_max = self._soil_ok
+        node_ids = set()
+        for reading in readings:
+            soil_moisture = reading.get("soil_moisture")
+            if isinstance(soil_moisture, (int, float)) and not ok_min <= soil_moisture <= ok_max:
+                node_ids.add(reading.get("node_id", "unknown"))
+
+        now = time.monotonic()
+        pending = []
+        for node_id in node_ids:
+            cached = self._weather_cache.get(node_id)
+            if cached and now - cached[0] < WEATHER_TTL_SECONDS:
+                continue
+            node_location = get_node_location(node_id)
+            if not node_location:
+                continue
+            lat = node_location.get("lat")
+            lon = node_location.get("lon")
+            if lat is not None and lon is not None:
+                pending.append((node_id, lat, lon, node_location.get("name", "Unknown")))
+
+        # A single node gains nothing from a thread; analyze() fetches it inline
+        if len(pending) < 2:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(len(pending), WEATHER_PREFETCH_WORKERS)) as executor:
+            for args in pending:
+                executor.submit(self._cached_weather, *args)
+
+    def _cached_weather(self, node_id: str, lat: float, lon: float,
+                        name: str) -> tuple[bool, Optional[str], float, Optional[str]]:
+        """
+        Get the weather verdict for a node, reusing it for WEATHER_TTL_SECONDS.
+
+        WeatherService only caches successful forecasts, so without this a
+        missing API key or an unreachable API is retried (and logged) for
+        every low-moisture reading.
+
+        Returns:
+            Tuple of (should_skip, skip_reason, confidence_multiplier, adjustment_reason)
+        """
+        now = time.monotonic()
+        cached = self._weather_cache.get(node_id)
+        if cached and now - cached[0] < WEATHER_TTL_SECONDS:
+            return cached[1]
+
+        should_skip, skip_reason = self.weather_service.should_skip_watering(node_id, lat, lon, name)
+        confidence_multiplier, adjustment_reason = self.weather_service.get_watering_confidence_adjustment(
+            node_id, lat, lon, name
+        )
+        result = (should_skip, skip_reason, confidence_multiplier, adjustment_reason)
+        self._weather_cache[node_id] = (now, result)
+        return result
+
+    def _analyze_watering(self, node_id: str, timestamp: str, soil_moisture: float,
+                          temp: Optional[float], humidity: Optional[float], lux: Optional[float],
+                          metrics: dict[str, Optional[float]]) -> Optional[Decision]:
         """
         Analyze watering needs based on soil moisture and environmental factors.
 
@@ -158,49 +336,29 @@ class ThresholdModel(BaseDecisionModel):
         - Low humidity → increases urgency
         - High light → increases urgency (more evaporation)
         """
-        soil_moisture = reading.get("soil_moisture")
-        if soil_moisture is None:
+        # Likely: soil moisture within the normal range
+        ok_min, ok_max = self._soil_ok
+        if ok_min <= soil_moisture <= ok_max:
             return None
 
-        thresholds = self.config["soil_moisture"]
-        temp = reading.get("temperature")
-        humidity = reading.get("relative_humidity")
-        lux = reading.get("lux")
+        critical_low, low, _, _, high = self._soil_t
 
         # Base decision from soil moisture
-        base_decision = None
-        threshold_crossed = None
-
-        if soil_moisture < thresholds["critical_low"]:
-            base_decision = {
-                "text": "Critical: Soil moisture extremely low",
-                "action": ActionType.WATER_IMMEDIATELY,
-                "severity": Severity.CRITICAL,
-                "confidence": 0.95,
-                "threshold": "critical_low"
-            }
-        elif soil_moisture < thresholds["low"]:
-            base_decision = {
-                "text": "Low soil moisture detected",
-                "action": ActionType.WATER_NEEDED,
-                "severity": Severity.WARNING,
-                "confidence": 0.85,
-                "threshold": "low"
-            }
-        elif soil_moisture > thresholds["high"]:
-            base_decision = {
-                "text": "Soil moisture high - reduce watering",
-                "action": ActionType.REDUCE_WATERING,
-                "severity": Severity.WARNING,
-                "confidence": 0.80,
-                "threshold": "high"
-            }
-
-        if not base_decision:
+        if soil_moisture < critical_low:
+            base_decision = _WATER_CRITICAL
+        elif soil_moisture < low:
+            base_decision = _WATER_LOW
+        elif soil_moisture > high:
+            base_decision = _WATER_HIGH
+        else:
             return None
 
+        decision_text, action, severity, confidence, threshold = base_decision
+        # Dry air and bright sun only escalate watering; cold temperatures and
+        # the weather adjustment below also apply to REDUCE_WATERING
+        escalates = action in _WATERING_ACTIONS
+
         # Check weather forecast if service is available
-        node_id = reading.get("node_id", "unknown")
         weather_context = {}
 
         if self.weather_enabled and self.weather_service:
@@ -214,76 +372,66 @@ class ThresholdModel(BaseDecisionModel):
 
                 if lat is not None and lon is not None:
                     # Check if we should skip watering due to rain/snow
-                    should_skip, skip_reason = self.weather_service.should_skip_watering(
+                    should_skip, skip_reason, confidence_multiplier, adjustment_reason = self._cached_weather(
                         node_id, lat, lon, name
                     )
 
-                    if should_skip and base_decision["action"] in [ActionType.WATER_IMMEDIATELY, ActionType.WATER_NEEDED]:
+                    if should_skip and escalates:
                         # Rain/snow expected - skip watering
                         return Decision(
                             node_id=node_id,
-                            timestamp=reading.get("timestamp", ""),
+                            timestamp=timestamp,
                             decision_text=f"Watering postponed: {skip_reason}",
                             action=ActionType.NONE,
                             severity=Severity.NORMAL,
                             confidence=0.90,
                             primary_metric="soil_moisture",
                             primary_value=soil_moisture,
-                            threshold_crossed=base_decision["threshold"],
+                            threshold_crossed=threshold,
                             context={"weather_skip": True, "weather_reason": skip_reason},
-                            metrics=self._extract_metrics(reading),
+                            metrics=metrics,
                             model_type=self.model_type
                         )
 
-                    # Get confidence adjustment based on weather
-                    confidence_multiplier, adjustment_reason = self.weather_service.get_watering_confidence_adjustment(
-                        node_id, lat, lon, name
-                    )
-
+                    # Confidence adjustment based on weather
                     if adjustment_reason:
                         weather_context["confidence_adjustment"] = adjustment_reason
                         weather_context["confidence_multiplier"] = confidence_multiplier
 
         # Adjust decision based on environmental factors
-        decision_text = base_decision["text"]
-        confidence = base_decision["confidence"]
         context = weather_context.copy()
 
         # Temperature influence
         if temp is not None:
-            temp_thresholds = self.config["temperature"]
-            if temp > temp_thresholds["very_hot"]:
-                if base_decision["action"] in [ActionType.WATER_IMMEDIATELY, ActionType.WATER_NEEDED]:
+            cold, _, hot, very_hot = self._temp_t
+            if temp > very_hot:
+                if escalates:
                     decision_text += f" (very hot conditions: {temp:.1f}°C increasing evaporation)"
                     confidence = min(confidence + 0.05, 0.99)
                     context["temperature_factor"] = "very_hot"
-            elif temp > temp_thresholds["hot"]:
-                if base_decision["action"] in [ActionType.WATER_IMMEDIATELY, ActionType.WATER_NEEDED]:
+            elif temp > hot:
+                if escalates:
                     decision_text += f" (hot conditions: {temp:.1f}°C)"
                     confidence = min(confidence + 0.03, 0.99)
                     context["temperature_factor"] = "hot"
-            elif temp < temp_thresholds["cold"]:
+            elif temp < cold:
                 context["temperature_factor"] = "cold"
                 # Cold weather reduces water needs - could lower urgency
                 confidence = max(confidence - 0.05, 0.70)
 
         # Humidity influence
-        if humidity is not None:
-            humidity_thresholds = self.config["relative_humidity"]
-            if humidity < humidity_thresholds["dry"]:
-                if base_decision["action"] in [ActionType.WATER_IMMEDIATELY, ActionType.WATER_NEEDED]:
-                    decision_text += f" (dry air: {humidity:.1f}% RH)"
-                    confidence = min(confidence + 0.04, 0.99)
-                    context["humidity_factor"] = "dry"
+        if escalates and humidity is not None:
+            if humidity < self._hum_t[0]:
+                decision_text += f" (dry air: {humidity:.1f}% RH)"
+                confidence = min(confidence + 0.04, 0.99)
+                context["humidity_factor"] = "dry"
 
         # Light influence
-        if lux is not None:
-            lux_thresholds = self.config["lux"]
-            if lux > lux_thresholds["bright"]:
-                if base_decision["action"] in [ActionType.WATER_IMMEDIATELY, ActionType.WATER_NEEDED]:
-                    decision_text += f" (bright sun increasing evaporation)"
-                    confidence = min(confidence + 0.03, 0.99)
-                    context["light_factor"] = "bright"
+        if escalates and lux is not None:
+            if lux > self._lux_t[3]:
+                decision_text += f" (bright sun increasing evaporation)"
+                confidence = min(confidence + 0.03, 0.99)
+                context["light_factor"] = "bright"
 
         # Apply weather confidence adjustment if available
         if "confidence_multiplier" in weather_context:
@@ -293,101 +441,76 @@ class ThresholdModel(BaseDecisionModel):
                 decision_text += f" (reduced confidence: {weather_context['confidence_adjustment']})"
 
         return Decision(
-            node_id=reading.get("node_id", "unknown"),
-            timestamp=reading.get("timestamp", ""),
+            node_id=node_id,
+            timestamp=timestamp,
             decision_text=decision_text,
-            action=base_decision["action"],
-            severity=base_decision["severity"],
+            action=action,
+            severity=severity,
             confidence=confidence,
             primary_metric="soil_moisture",
             primary_value=soil_moisture,
-            threshold_crossed=base_decision["threshold"],
+            threshold_crossed=threshold,
             context=context,
-            metrics=self._extract_metrics(reading),
+            metrics=metrics,
             model_type=self.model_type
         )
 
-    def _analyze_charging(self, reading: dict[str, Any]) -> Optional[Decision]:
+    def _analyze_charging(self, node_id: str, timestamp: str, voltage: float, lux: Optional[float],
+                          metrics: dict[str, Optional[float]]) -> Optional[Decision]:
         """
         Analyze charging/power needs based on voltage and light availability.
 
         Environmental influences:
         - Low light → more conservative with power, higher urgency for charging
         """
-        voltage = reading.get("voltage")
-        if voltage is None:
+        # Likely: voltage above both thresholds
+        if voltage >= self._volt_ok_min:
             return None
 
-        thresholds = self.config["voltage"]
-        lux = reading.get("lux")
+        critical_low, low, _, _ = self._volt_t
 
         # Base decision from voltage
-        base_decision = None
-
-        if voltage < thresholds["critical_low"]:
-            base_decision = {
-                "text": "Critical: Battery voltage critically low",
-                "action": ActionType.CHARGE_BATTERY_URGENT,
-                "severity": Severity.CRITICAL,
-                "confidence": 0.98,
-                "threshold": "critical_low"
-            }
-        elif voltage < thresholds["low"]:
-            base_decision = {
-                "text": "Low battery voltage",
-                "action": ActionType.CHARGE_BATTERY,
-                "severity": Severity.WARNING,
-                "confidence": 0.90,
-                "threshold": "low"
-            }
-
-        if not base_decision:
+        if voltage < critical_low:
+            base_decision = _CHARGE_CRITICAL
+        elif voltage < low:
+            base_decision = _CHARGE_LOW
+        else:
             return None
 
+        decision_text, action, severity, confidence, threshold = base_decision
+
         # Adjust decision based on light availability
-        decision_text = base_decision["text"]
-        confidence = base_decision["confidence"]
         context = {}
 
         if lux is not None:
-            lux_thresholds = self.config["lux"]
-            if lux < lux_thresholds["dark"]:
+            dark, low_light, _, bright = self._lux_t
+            if lux < dark:
                 decision_text += " (no sunlight - check solar panel positioning)"
                 confidence = min(confidence + 0.02, 0.99)
                 context["light_factor"] = "dark"
                 context["charging_capacity"] = "none"
-            elif lux < lux_thresholds["low_light"]:
+            elif lux < low_light:
                 decision_text += " (low light - limited solar charging)"
                 context["light_factor"] = "low"
                 context["charging_capacity"] = "limited"
-            elif lux > lux_thresholds["bright"]:
+            elif lux > bright:
                 # Good sunlight but still low voltage - might be a panel issue
                 decision_text += " (good sunlight available - check solar panel)"
-                base_decision["action"] = ActionType.CHECK_SOLAR_PANEL
+                action = ActionType.CHECK_SOLAR_PANEL
                 context["light_factor"] = "bright"
                 context["charging_capacity"] = "full"
 
         return Decision(
-            node_id=reading.get("node_id", "unknown"),
-            timestamp=reading.get("timestamp", ""),
+            node_id=node_id,
+            timestamp=timestamp,
             decision_text=decision_text,
-            action=base_decision["action"],
-            severity=base_decision["severity"],
+            action=action,
+            severity=severity,
             confidence=confidence,
             primary_metric="voltage",
             primary_value=voltage,
-            threshold_crossed=base_decision["threshold"],
+            threshold_crossed=threshold,
             context=context,
-            metrics=self._extract_metrics(reading),
+            metrics=metrics,
             model_type=self.model_type
         )
-
-    def _extract_metrics(self, reading: dict[str, Any]) -> dict[str, Optional[float]]:
-        """Extract all sensor metrics from a reading."""
-        return {
-            "soil_moisture": reading.get("soil_moisture"),
-            "temperature": reading.get("temperature"),
-            "relative_humidity": reading.get("relative_humidity"),
-            "voltage": reading.get("voltage"),
-            "lux": reading.get("lux")
-        }
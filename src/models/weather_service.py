@@ -6,15 +6,27 @@ is expected, which influences watering decisions.
 """
 
 import json
+import logging
+import os
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from typing import Optional, Any, Tuple
-from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from datetime import datetime
+from dataclasses import dataclass
+import atexit
+import heapq
 import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class WeatherForecast:
     """Weather forecast data for a location."""
     node_id: str
@@ -32,23 +44,172 @@ class WeatherForecast:
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
-        return asdict(self)
+        # One literal instead of dataclasses.asdict (which deep-copies every field)
+        return {
+            "node_id": self.node_id,
+            "location_name": self.location_name,
+            "lat": self.lat,
+            "lon": self.lon,
+            "timestamp": self.timestamp,
+            "forecast_hours": self.forecast_hours,
+            "precipitation_expected": self.precipitation_expected,
+            "precipitation_probability": self.precipitation_probability,
+            "precipitation_amount_mm": self.precipitation_amount_mm,
+            "precipitation_types": list(self.precipitation_types),
+            "temperature_avg": self.temperature_avg,
+            "description": self.description,
+        }
+
+
+# WeatherCache also sweeps out expired entries every this many get() calls
+PURGE_EVERY_GETS = 64
+
+# A file-backed WeatherCache is written at most this often (and at exit)
+SAVE_INTERVAL_SECONDS = 60
 
 
 class WeatherCache:
-    """Simple in-memory cache for weather forecasts."""
+    """Simple in-memory cache for weather forecasts, optionally backed by a file."""
 
-    def __init__(self, duration_minutes: int = 30, max_entries: int = 100):
+    def __init__(self, duration_minutes: int = 30, max_entries: int = 100,
+                 file_path: Optional[str] = None):
         """
         Initialize weather cache.
 
         Args:
             duration_minutes: How long to cache entries (default 30 minutes)
             max_entries: Maximum number of cached entries
+            file_path: Optional JSON file the cache is saved to (at most every
+                       SAVE_INTERVAL_SECONDS, and at exit) and reloaded from on
+                       startup, so a restart doesn't refetch every node's forecast
         """
         self.duration_minutes = duration_minutes
+        self._duration_seconds = duration_minutes * 60
         self.max_entries = max_entries
-        self._cache: dict[str, dict[str, Any]] = {}
+        self.file_path = Path(file_path) if file_path else None
+        # Least recently used first; get() moves hits to the end
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        # (cached_time, key) per set(), oldest first; entries superseded by a
+        # later set() of the same key are skipped when popped. Times are
+        # time.monotonic() values, converted to wall-clock only in the file.
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._gets_since_purge = 0
+        self._lock = Lock()
+
+        # Persistence state: _version counts changes, _saved_version is the
+        # last one written; _file_lock serializes writes outside _lock
+        self._version = 0
+        self._saved_version = 0
+        self._last_save = time.monotonic()
+        self._file_lock = Lock()
+
+        if self.file_path:
+            self._load()
+            atexit.register(self.flush)
+
+    def _load(self) -> None:
+        """
+        Load unexpired entries from the cache file.
+
+        Malformed entries are skipped, and only the newest max_entries are
+        kept; a damaged file costs some refetches, never the cache itself.
+        """
+        try:
+            with open(self.file_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        except FileNotFoundError:
+            return
+        except Exception:
+            logger.warning("Failed to load weather cache %s", self.file_path, exc_info=True)
+            return
+        if not isinstance(data, dict):
+            logger.warning("Ignoring weather cache %s: expected a JSON object", self.file_path)
+            return
+
+        now_wall = time.time()
+        now_mono = time.monotonic()
+        fresh = []
+        for key, entry in data.items():
+            if not isinstance(entry, dict):
+                continue
+            saved_at = entry.get("timestamp")
+            if isinstance(saved_at, bool) or not isinstance(saved_at, (int, float)):
+                continue
+            # A timestamp in the future (clock changed) counts as brand new
+            age = max(now_wall - saved_at, 0.0)
+            if age <= self._duration_seconds:
+                fresh.append((age, key, entry))
+
+        # Oldest first, so the LRU order matches the entries' age
+        fresh.sort(key=lambda item: item[0], reverse=True)
+        for age, key, entry in fresh[max(len(fresh) - self.max_entries, 0):]:
+            try:
+                forecast = WeatherForecast(**entry["forecast"])
+            except Exception:
+                continue
+            cached_time = now_mono - age
+            self._cache[key] = {"timestamp": cached_time, "forecast": forecast}
+            heapq.heappush(self._expiry_heap, (cached_time, key))
+
+    def _snapshot(self) -> tuple[int, dict[str, Any]]:
+        """Copy the cache in its file format (caller holds the lock)."""
+        wall_offset = time.time() - time.monotonic()
+        data = {
+            key: {"timestamp": entry["timestamp"] + wall_offset, "forecast": entry["forecast"].to_dict()}
+            for key, entry in self._cache.items()
+        }
+        self._last_save = time.monotonic()
+        return self._version, data
+
+    def _changed(self) -> Optional[tuple[int, dict[str, Any]]]:
+        """
+        Record a change (caller holds the lock).
+
+        Returns:
+            A snapshot to pass to _write() once the lock is released, or None
+            if the cache has no file or was saved less than
+            SAVE_INTERVAL_SECONDS ago.
+        """
+        self._version += 1
+        if not self.file_path or time.monotonic() - self._last_save < SAVE_INTERVAL_SECONDS:
+            return None
+        return self._snapshot()
+
+    def _write(self, snapshot: Optional[tuple[int, dict[str, Any]]]) -> None:
+        """Write a snapshot to the cache file, unless a newer one was already written."""
+        if snapshot is None:
+            return
+
+        version, data = snapshot
+        with self._file_lock:
+            if version <= self._saved_version:
+                return
+            try:
+                self.file_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.file_path.with_suffix('.json.tmp')
+                tmp_path.write_bytes(orjson.dumps(data))
+                os.replace(tmp_path, self.file_path)
+                self._saved_version = version
+            except Exception:
+                logger.exception("Failed to save weather cache %s", self.file_path)
+
+    def flush(self) -> None:
+        """Write any unsaved changes to the cache file now (also runs at exit)."""
+        if not self.file_path:
+            return
+        with self._lock:
+            snapshot = self._snapshot() if self._version > self._saved_version else None
+        self._write(snapshot)
+
+    def _purge_expired(self) -> None:
+        """Drop every expired entry, not just the ones get() asks for (caller holds the lock)."""
+        cutoff = time.monotonic() - self._duration_seconds
+        heap = self._expiry_heap
+        while heap and heap[0][0] < cutoff:
+            cached_time, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            if entry is not None and entry["timestamp"] == cached_time:
+                self._cache.pop(key, None)
 
     def get(self, key: str) -> Optional[WeatherForecast]:
         """
@@ -60,23 +221,29 @@ class WeatherCache:
         Returns:
             WeatherForecast if cached and valid, None otherwise
         """
-        if key not in self._cache:
-            return None
+        with self._lock:
+            self._gets_since_purge += 1
+            if self._gets_since_purge >= PURGE_EVERY_GETS:
+                self._gets_since_purge = 0
+                self._purge_expired()
+
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
 
-        entry = self._cache[key]
-        cached_time = entry.get("timestamp")
+            cached_time = entry.get("timestamp")
 
-        if not cached_time:
-            return None
+            if cached_time is None:
+                return None
 
-        # Check if cache is still valid
-        age_minutes = (datetime.now() - cached_time).total_seconds() / 60
-        if age_minutes > self.duration_minutes:
-            # Cache expired
-            del self._cache[key]
-            return None
+            # Check if cache is still valid
+            if time.monotonic() - cached_time > self._duration_seconds:
+                # Cache expired
+                self._cache.pop(key, None)
+                return None
 
-        return entry.get("forecast")
+            self._cache.move_to_end(key)
+            return entry.get("forecast")
 
     def set(self, key: str, forecast: WeatherForecast) -> None:
         """
@@ -86,16 +253,22 @@ class WeatherCache:
             key: Cache key (usually node_id)
             forecast: WeatherForecast to cache
         """
-        # Implement simple LRU by removing oldest if at capacity
-        if len(self._cache) >= self.max_entries:
-            oldest_key = min(self._cache.keys(),
-                           key=lambda k: self._cache[k]["timestamp"])
-            del self._cache[oldest_key]
-
-        self._cache[key] = {
-            "timestamp": datetime.now(),
-            "forecast": forecast
-        }
+        with self._lock:
+            # Expired entries go first, then the least recently used if still at capacity
+            self._purge_expired()
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            elif len(self._cache) >= self.max_entries:
+                self._cache.popitem(last=False)
+
+            cached_time = time.monotonic()
+            self._cache[key] = {
+                "timestamp": cached_time,
+                "forecast": forecast
+            }
+            heapq.heappush(self._expiry_heap, (cached_time, key))
+            snapshot = self._changed()
+        self._write(snapshot)
 
     def clear(self) -> int:
         """
@@ -104,8 +277,13 @@ class WeatherCache:
         Returns:
             Number of entries cleared
         """
-        count = len(self._cache)
-        self._cache.clear()
+        with self._lock:
+            count = len(self._cache)
+            self._cache.clear()
+            self._expiry_heap.clear()
+            self._version += 1
+        # Always persist a clear right away, so a restart can't bring entries back
+        self.flush()
         return count
 
 
@@ -125,11 +303,41 @@ class WeatherService:
 
         self.config = self._load_config(config_path)
 
+        # Settings read on every forecast parse and decision, looked up once here
+        forecast_config = self.config.get("forecast", {})
+        self._hours_ahead = forecast_config.get("hours_ahead", 24)
+        self._precip_threshold = forecast_config.get("precipitation_threshold_mm", 1.0)
+        self._precip_types = frozenset(forecast_config.get("precipitation_types", ["Rain", "Drizzle", "Snow"]))
+        decision_rules = self.config.get("decision_rules", {})
+        self._skip_rain = decision_rules.get("skip_watering_if_rain_expected", True)
+        self._skip_snow = decision_rules.get("skip_watering_if_snow_expected", True)
+        self._reduction_heavy_rain = decision_rules.get("confidence_reduction_heavy_rain", 0.7)
+        self._reduction_light_rain = decision_rules.get("confidence_reduction_light_rain", 0.3)
+
+        # One pooled session so cache misses reuse the TCP/TLS connection to
+        # the weather API instead of handshaking on every request
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        # node_id -> Future for forecasts currently being fetched (see get_forecast)
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = Lock()
+
         # Initialize cache if enabled
         if self.config.get("cache", {}).get("enabled", True):
             cache_duration = self.config["cache"].get("duration_minutes", 30)
             max_entries = self.config["cache"].get("max_entries", 100)
-            self.cache = WeatherCache(cache_duration, max_entries)
+            cache_file = None
+            if self.config["cache"].get("persist", True):
+                project_root = Path(__file__).parent.parent.parent
+                cache_file = str(project_root / 'data' / 'weather_cache.json')
+            self.cache = WeatherCache(cache_duration, max_entries, cache_file)
         else:
             self.cache = None
 
@@ -139,7 +347,7 @@ class WeatherService:
             with open(config_path, 'r') as f:
                 return json.load(f)
         except Exception as e:
-            print(f"[WARNING] Failed to load weather config: {e}")
+            logger.warning("Failed to load weather config: %s", e)
             # Return minimal default config
             return {
                 "api": {
@@ -175,12 +383,29 @@ class WeatherService:
             if cached:
                 return cached
 
-        # Fetch from API
-        forecast = self._fetch_from_api(node_id, lat, lon, node_name)
+        # Only one thread fetches a given node; concurrent misses wait for its result
+        with self._inflight_lock:
+            future = self._inflight.get(node_id)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[node_id] = future
+
+        if not is_owner:
+            return future.result()
 
-        # Cache the result if successful
-        if forecast and self.cache:
-            self.cache.set(node_id, forecast)
+        forecast = None
+        try:
+            # Fetch from API
+            forecast = self._fetch_from_api(node_id, lat, lon, node_name)
+
+            # Cache the result if successful
+            if forecast and self.cache:
+                self.cache.set(node_id, forecast)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[node_id]
+            future.set_result(forecast)
 
         return forecast
 
@@ -202,7 +427,7 @@ class WeatherService:
         api_key = api_config.get("api_key", "")
 
         if not api_key or api_key == "YOUR_OPENWEATHERMAP_API_KEY_HERE":
-            print(f"[WARNING] No valid OpenWeatherMap API key configured")
+            logger.warning("No valid OpenWeatherMap API key configured")
             return None
 
         base_url = api_config.get("base_url", "https://api.openweathermap.org/data/2.5")
@@ -218,20 +443,20 @@ class WeatherService:
         }
 
         try:
-            response = requests.get(url, params=params, timeout=timeout)
+            response = self._session.get(url, params=params, timeout=timeout)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             return self._parse_forecast(node_id, node_name, lat, lon, data)
 
         except requests.exceptions.Timeout:
-            print(f"[ERROR] Weather API timeout for node {node_id}")
+            logger.error("Weather API timeout for node %s", node_id)
             return None
         except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Weather API request failed for node {node_id}: {e}")
+            logger.error("Weather API request failed for node %s: %s", node_id, e)
             return None
-        except Exception as e:
-            print(f"[ERROR] Unexpected error fetching weather for node {node_id}: {e}")
+        except Exception:
+            logger.exception("Unexpected error fetching weather for node %s", node_id)
             return None
 
     def _parse_forecast(self, node_id: str, node_name: str, lat: float,
@@ -250,19 +475,17 @@ class WeatherService:
             WeatherForecast object
         """
         try:
-            forecast_config = self.config.get("forecast", {})
-            hours_ahead = forecast_config.get("hours_ahead", 24)
-            precip_threshold = forecast_config.get("precipitation_threshold_mm", 1.0)
-            precip_types = forecast_config.get("precipitation_types", ["Rain", "Drizzle", "Snow"])
+            hours_ahead = self._hours_ahead
+            precip_threshold = self._precip_threshold
+            precip_types = self._precip_types
 
             # Get forecast list from API response
             forecast_list = api_data.get("list", [])
             if not forecast_list:
                 return None
 
-            # Filter forecasts within our time window
-            now = datetime.now()
-            cutoff_time = now + timedelta(hours=hours_ahead)
+            # Filter forecasts within our time window ("dt" is Unix epoch seconds)
+            cutoff_ts = time.time() + hours_ahead * 3600
 
             total_precip_mm = 0.0
             max_precip_prob = 0.0
@@ -270,11 +493,8 @@ class WeatherService:
             temps = []
 
             for item in forecast_list:
-                # Parse forecast timestamp
-                forecast_time = datetime.fromtimestamp(item.get("dt", 0))
-
                 # Only look at forecasts within our window
-                if forecast_time > cutoff_time:
+                if item.get("dt", 0) > cutoff_ts:
                     break
 
                 # Get precipitation data
@@ -330,8 +550,8 @@ class WeatherService:
                 description=description
             )
 
-        except Exception as e:
-            print(f"[ERROR] Failed to parse weather forecast: {e}")
+        except Exception:
+            logger.exception("Failed to parse weather forecast")
             return None
 
     def should_skip_watering(self, node_id: str, lat: float, lon: float,
@@ -356,14 +576,12 @@ class WeatherService:
             # No forecast available - don't skip (fail open)
             return (False, None)
 
-        decision_rules = self.config.get("decision_rules", {})
-
         if not forecast.precipitation_expected:
             return (False, None)
 
         # Check if we should skip based on precipitation type
-        skip_rain = decision_rules.get("skip_watering_if_rain_expected", True)
-        skip_snow = decision_rules.get("skip_watering_if_snow_expected", True)
+        skip_rain = self._skip_rain
+        skip_snow = self._skip_snow
 
         has_rain = any(p in ["Rain", "Drizzle"] for p in forecast.precipitation_types)
         has_snow = "Snow" in forecast.precipitation_types
@@ -394,16 +612,14 @@ class WeatherService:
         if not forecast or not forecast.precipitation_expected:
             return (1.0, None)  # No adjustment
 
-        decision_rules = self.config.get("decision_rules", {})
-
         # Determine reduction based on precipitation amount
         if forecast.precipitation_amount_mm > 5.0:
             # Heavy rain expected
-            reduction = decision_rules.get("confidence_reduction_heavy_rain", 0.7)
+            reduction = self._reduction_heavy_rain
             reason = f"Heavy precipitation expected ({forecast.precipitation_amount_mm:.1f}mm)"
         else:
             # Light rain expected
-            reduction = decision_rules.get("confidence_reduction_light_rain", 0.3)
+            reduction = self._reduction_light_rain
             reason = f"Light precipitation expected ({forecast.precipitation_amount_mm:.1f}mm)"
 
         # Return multiplier (1.0 - reduction)
@@ -1,20 +1,155 @@
-from sqlalchemy import create_engine, text
-from typing import Optional, Any
-import json
+from sqlalchemy import create_engine, text, RowMapping
+from typing import Optional, Any, Iterator
+import logging
+import orjson
 import os
+import select
+import threading
+import time
+import psycopg2
+import psycopg2.extensions
 from datetime import datetime
 from pathlib import Path
+from queue import Queue, Empty, Full
 import sys
 
 # Add parent directory to path to import utils
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.node_config import get_all_nodes
 
+logger = logging.getLogger(__name__)
+
+# Channel used by the sensor_db insert trigger (see TimescaleStorage.init_db)
+NOTIFY_CHANNEL = "sensor_insert"
+
+# Notifications buffered per streaming client before new ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Connection pool per API worker process. Keep
+# WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below Postgres's
+# max_connections (100 by default), leaving room for the collector.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Fail a request after this many seconds waiting for a pooled connection
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+
+# Seconds get_last_reading reuses its result, so a burst of streaming
+# clients (re)connecting costs one query
+LAST_READING_TTL = 1.0
+
+
+# Queries are module-level constants with a fixed shape: optional filters are
+# written as "(:param IS NULL OR ...)" instead of being concatenated per call,
+# so every call reuses the same compiled statement.
+LATEST_QUERY = text("""
+    SELECT node_id, timestamp, temperature, relative_humidity,
+           soil_moisture, lux, voltage
+    FROM sensor_db
+    WHERE (CAST(:node_id AS VARCHAR) IS NULL OR node_id = :node_id)
+    ORDER BY timestamp DESC
+    LIMIT :limit
+""")
+
+LAST_READING_QUERY = text("""
+    SELECT node_id, timestamp, temperature, relative_humidity,
+           soil_moisture, lux, voltage
+    FROM sensor_db
+    ORDER BY timestamp DESC
+    LIMIT 1
+""")
+
+HISTORICAL_QUERY = text("""
+    SELECT node_id, timestamp, temperature, relative_humidity,
+           soil_moisture, lux, voltage
+    FROM sensor_db
+    WHERE timestamp >= NOW() - (:hours * INTERVAL '1 hour')
+    ORDER BY timestamp ASC
+""")
+
+LATEST_PER_NODE_QUERY = text("""
+    SELECT DISTINCT ON (node_id)
+           node_id, timestamp, temperature, relative_humidity,
+           soil_moisture, lux, voltage
+    FROM sensor_db
+    WHERE (CAST(:node_ids AS VARCHAR[]) IS NULL OR node_id = ANY(CAST(:node_ids AS VARCHAR[])))
+    ORDER BY node_id, timestamp DESC
+""")
+
+NODE_STATS_QUERY = text("""
+    SELECT
+        node_id,
+        COUNT(*) as reading_count,
+        AVG(temperature) as avg_temp,
+        AVG(relative_humidity) as avg_humidity,
+        AVG(soil_moisture) as avg_soil_moisture,
+        AVG(lux) as avg_lux,
+        AVG(voltage) as avg_voltage,
+        MAX(timestamp) as last_seen
+    FROM sensor_db
+    WHERE timestamp >= NOW() - INTERVAL '24 hours'
+      AND (CAST(:node_ids AS VARCHAR[]) IS NULL OR node_id = ANY(CAST(:node_ids AS VARCHAR[])))
+    GROUP BY node_id
+    ORDER BY last_seen DESC
+""")
+
+# Reads pre-aggregated 5-minute buckets from the sensor_5m continuous aggregate.
+# Uses [start_time, end_time] when both are given, otherwise the last :hours hours.
+TIMESERIES_QUERY = text("""
+    SELECT
+        bucket AS timestamp,
+        node_id,
+        avg_temp,
+        avg_humidity,
+        avg_soil_moisture,
+        avg_lux,
+        avg_voltage,
+        max_temp,
+        min_temp
+    FROM sensor_5m
+    WHERE bucket >= COALESCE(CAST(:start_time AS TIMESTAMP), NOW() - (:hours * INTERVAL '1 hour'))
+      AND (CAST(:end_time AS TIMESTAMP) IS NULL OR bucket <= CAST(:end_time AS TIMESTAMP))
+      AND (CAST(:node_id AS VARCHAR) IS NULL OR node_id = :node_id)
+    ORDER BY bucket ASC
+""")
+
+EXPORT_QUERY = text("""
+    SELECT
+        node_id,
+        timestamp,
+        temperature,
+        relative_humidity,
+        soil_moisture,
+        lux,
+        voltage
+    FROM sensor_db
+    WHERE (CAST(:start_time AS TIMESTAMP) IS NULL OR timestamp >= CAST(:start_time AS TIMESTAMP))
+      AND (CAST(:end_time AS TIMESTAMP) IS NULL OR timestamp <= CAST(:end_time AS TIMESTAMP))
+      AND (CAST(:node_id AS VARCHAR) IS NULL OR node_id = :node_id)
+    ORDER BY timestamp ASC
+""")
+
+
+# JSON endpoints return plain dict(row): orjson writes datetimes in the same
+# ISO format as isoformat(), without a Python call per value. Only the CSV
+# export needs them converted up front.
+def _row_to_dict(row: RowMapping) -> dict[str, Any]:
+    """Convert a result row mapping to a dict with datetimes as ISO strings."""
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()}
+
 
 class DataAPI:
     def __init__(self, db_url: str, decisions_file: Optional[str] = None):
         self.db_url = db_url
-        self.engine = create_engine(db_url, pool_pre_ping=True)
+        self.engine = create_engine(
+            db_url,
+            pool_pre_ping=True,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            # Replace connections older than 30 minutes before idle timeouts
+            # on the server or a proxy can cut them
+            pool_recycle=1800,
+        )
 
         if decisions_file:
             self.decisions_file = decisions_file
@@ -22,144 +157,109 @@ class DataAPI:
             project_root = Path(__file__).parent.parent.parent
             self.decisions_file = str(project_root / 'data' / 'decisions.json')
 
-    def get_latest_data(self, limit: int = 50) -> list[dict[str, Any]]:
-        with self.engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT node_id, timestamp, temperature, relative_humidity,
-                       soil_moisture, lux, voltage
-                FROM sensor_db
-                ORDER BY timestamp DESC
-                LIMIT :limit
-            """), {"limit": limit})
-
-            data = []
-            for row in result:
-                data.append({
-                    "node_id": row[0],
-                    "timestamp": row[1].isoformat() if row[1] else None,
-                    "temperature": float(row[2]) if row[2] is not None else None,
-                    "relative_humidity": float(row[3]) if row[3] is not None else None,
-                    "soil_moisture": float(row[4]) if row[4] is not None else None,
-                    "lux": float(row[5]) if row[5] is not None else None,
-                    "voltage": float(row[6]) if row[6] is not None else None
-                })
-
-            return data
+        # Queues of the clients in listen_for_readings, fed by _notify_loop
+        self._subscribers: set[Queue[str]] = set()
+        self._subscribers_lock = threading.Lock()
+        self._notify_thread: Optional[threading.Thread] = None
 
-    def get_historical_data(self, hours: int = 24) -> list[dict[str, Any]]:
+        # (file signature, decisions sorted newest first) from the last read;
+        # the collector replaces the file on every write, so a new
+        # (mtime, size, inode) means new contents
+        self._decisions_cache: tuple[Optional[tuple[int, int, int]], list[dict[str, Any]]] = (None, [])
+
+        # (monotonic time fetched, row) from the last get_last_reading
+        self._last_reading: tuple[float, Optional[dict[str, Any]]] = (float("-inf"), None)
+
+    def get_latest_data(self, limit: int = 50, node_id: Optional[str] = None) -> list[dict[str, Any]]:
+        # Filtering by node lets Postgres walk the (node_id, timestamp DESC) index
         with self.engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT node_id, timestamp, temperature, relative_humidity,
-                       soil_moisture, lux, voltage
-                FROM sensor_db
-                WHERE timestamp >= NOW() - INTERVAL ':hours hours'
-                ORDER BY timestamp ASC
-            """), {"hours": hours})
-
-            data = []
-            for row in result:
-                data.append({
-                    "node_id": row[0],
-                    "timestamp": row[1].isoformat() if row[1] else None,
-                    "temperature": float(row[2]) if row[2] is not None else None,
-                    "relative_humidity": float(row[3]) if row[3] is not None else None,
-                    "soil_moisture": float(row[4]) if row[4] is not None else None,
-                    "lux": float(row[5]) if row[5] is not None else None,
-                    "voltage": float(row[6]) if row[6] is not None else None
-                })
-
-            return data
-
-    def get_node_stats(self) -> list[dict[str, Any]]:
+            result = conn.execute(LATEST_QUERY, {"limit": limit, "node_id": node_id or None})
+
+            return [dict(row) for row in result.mappings()]
+
+    def get_last_reading(self) -> Optional[dict[str, Any]]:
+        """
+        Get the single most recent reading across all nodes.
+
+        Used to seed a new stream; the result is reused for LAST_READING_TTL
+        seconds.
+
+        Returns:
+            The newest reading, or None if the table is empty.
+        """
+        fetched_at, row = self._last_reading
+        now = time.monotonic()
+        if now - fetched_at < LAST_READING_TTL:
+            return row
+
         with self.engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT
-                    node_id,
-                    COUNT(*) as reading_count,
-                    AVG(temperature) as avg_temp,
-                    AVG(relative_humidity) as avg_humidity,
-                    AVG(soil_moisture) as avg_soil_moisture,
-                    AVG(lux) as avg_lux,
-                    AVG(voltage) as avg_voltage,
-                    MAX(timestamp) as last_seen
-                FROM sensor_db
-                WHERE timestamp >= NOW() - INTERVAL '24 hours'
-                GROUP BY node_id
-                ORDER BY last_seen DESC
-            """))
-
-            stats = []
-            for row in result:
-                stats.append({
-                    "node_id": row[0],
-                    "reading_count": row[1],
-                    "avg_temp": float(row[2]) if row[2] else None,
-                    "avg_humidity": float(row[3]) if row[3] else None,
-                    "avg_soil_moisture": float(row[4]) if row[4] else None,
-                    "avg_lux": float(row[5]) if row[5] else None,
-                    "avg_voltage": float(row[6]) if row[6] else None,
-                    "last_seen": row[7].isoformat() if row[7] else None
-                })
-
-            return stats
+            result = conn.execute(LAST_READING_QUERY).mappings().first()
 
-    def get_timeseries_data(self, node_id: Optional[str] = None, hours: Optional[int] = None, start_time: Optional[str] = None, end_time: Optional[str] = None) -> list[dict[str, Any]]:
-        base_query = """
-            SELECT
-                time_bucket('5 minutes', timestamp) AS bucket,
-                node_id,
-                AVG(temperature) as avg_temp,
-                AVG(relative_humidity) as avg_humidity,
-                AVG(soil_moisture) as avg_soil_moisture,
-                AVG(lux) as avg_lux,
-                AVG(voltage) as avg_voltage,
-                MAX(temperature) as max_temp,
-                MIN(temperature) as min_temp
-            FROM sensor_db
-            WHERE 1=1
+        row = dict(result) if result is not None else None
+        self._last_reading = (now, row)
+        return row
+
+    def get_historical_data(self, hours: int = 24) -> list[dict[str, Any]]:
+        return list(self.iter_historical_data(hours=hours))
+
+    def iter_historical_data(self, hours: int = 24) -> Iterator[dict[str, Any]]:
         """
+        Yield historical readings one at a time.
 
-        params = {}
+        Uses a server-side cursor so large time ranges are never fully
+        buffered in memory.
 
-        # Handle time range
-        if start_time and end_time:
-            base_query += " AND timestamp >= :start_time AND timestamp <= :end_time"
-            params["start_time"] = start_time
-            params["end_time"] = end_time
-        elif hours:
-            base_query += " AND timestamp >= NOW() - INTERVAL ':hours hours'"
-            params["hours"] = hours
-        else:
-            # Default to 12 hours if nothing specified
-            base_query += " AND timestamp >= NOW() - INTERVAL '12 hours'"
+        Args:
+            hours: Number of hours of history to return.
+
+        Yields:
+            Reading dictionaries in ascending timestamp order.
+        """
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=1000).execute(HISTORICAL_QUERY, {"hours": hours})
 
-        if node_id:
-            base_query += " AND node_id = :node_id"
-            params["node_id"] = node_id
+            for row in result.mappings():
+                yield dict(row)
 
-        base_query += """
-            GROUP BY bucket, node_id
-            ORDER BY bucket ASC
+    def get_latest_per_node(self, node_ids: Optional[list[str]] = None) -> list[dict[str, Any]]:
         """
+        Get the most recent reading for each node in a single query.
+
+        Args:
+            node_ids: Optional list of node IDs to restrict the lookup to.
+
+        Returns:
+            List of reading dictionaries, one per node.
+        """
+        params = {"node_ids": list(node_ids) if node_ids is not None else None}
+
+        with self.engine.connect() as conn:
+            result = conn.execute(LATEST_PER_NODE_QUERY, params)
+
+            return [dict(row) for row in result.mappings()]
+
+    def get_node_stats(self, node_ids: Optional[list[str]] = None) -> list[dict[str, Any]]:
+        params = {"node_ids": list(node_ids) if node_ids is not None else None}
 
         with self.engine.connect() as conn:
-            result = conn.execute(text(base_query), params)
-
-            data = []
-            for row in result:
-                data.append({
-                    "timestamp": row[0].isoformat() if row[0] else None,
-                    "node_id": row[1],
-                    "avg_temp": float(row[2]) if row[2] else None,
-                    "avg_humidity": float(row[3]) if row[3] else None,
-                    "avg_soil_moisture": float(row[4]) if row[4] else None,
-                    "avg_lux": float(row[5]) if row[5] else None,
-                    "avg_voltage": float(row[6]) if row[6] else None,
-                    "max_temp": float(row[7]) if row[7] else None,
-                    "min_temp": float(row[8]) if row[8] else None
-                })
-
-            return data
+            result = conn.execute(NODE_STATS_QUERY, params)
+
+            return [dict(row) for row in result.mappings()]
+
+    def get_timeseries_data(self, node_id: Optional[str] = None, hours: Optional[int] = None, start_time: Optional[str] = None, end_time: Optional[str] = None) -> list[dict[str, Any]]:
+        # A custom range needs both ends; otherwise fall back to hours (default 12)
+        has_range = bool(start_time and end_time)
+        params = {
+            "start_time": start_time if has_range else None,
+            "end_time": end_time if has_range else None,
+            "hours": hours or 12,
+            "node_id": node_id or None,
+        }
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=1000).execute(TIMESERIES_QUERY, params)
+
+            return [dict(row) for row in result.mappings()]
 
     def get_node_locations(self) -> list[dict[str, Any]]:
         """
@@ -168,11 +268,11 @@ class DataAPI:
         Returns:
             List of node dictionaries with location and sensor statistics.
         """
-        # Load nodes from config file
-        nodes = get_all_nodes()
+        # Load nodes from config file (copied, since the config list is cached)
+        nodes = [dict(node) for node in get_all_nodes()]
 
-        # Enrich with latest sensor statistics
-        stats = self.get_node_stats()
+        # Enrich with sensor statistics, aggregating only the configured nodes
+        stats = self.get_node_stats(node_ids=[node["node_id"] for node in nodes])
         node_data_map = {stat["node_id"]: stat for stat in stats}
 
         for node in nodes:
@@ -182,51 +282,130 @@ class DataAPI:
         return nodes
 
     def get_export_data(self, start_time: Optional[str] = None, end_time: Optional[str] = None, node_id: Optional[str] = None) -> list[dict[str, Any]]:
-        query = """
-            SELECT
-                node_id,
-                timestamp,
-                temperature,
-                relative_humidity,
-                soil_moisture,
-                lux,
-                voltage
-            FROM sensor_db
-            WHERE 1=1
+        return list(self.iter_export_data(start_time=start_time, end_time=end_time, node_id=node_id))
+
+    def iter_export_data(self, start_time: Optional[str] = None, end_time: Optional[str] = None, node_id: Optional[str] = None) -> Iterator[dict[str, Any]]:
         """
+        Yield readings for CSV export one at a time.
 
-        params = {}
+        Uses a server-side cursor so exporting a long range never buffers
+        the whole table in memory.
 
-        if start_time:
-            query += " AND timestamp >= :start_time"
-            params["start_time"] = start_time
+        Args:
+            start_time: Optional inclusive start of the range.
+            end_time: Optional inclusive end of the range.
+            node_id: Optional node to restrict the export to.
 
-        if end_time:
-            query += " AND timestamp <= :end_time"
-            params["end_time"] = end_time
+        Yields:
+            Reading dictionaries in ascending timestamp order.
+        """
+        params = {
+            "start_time": start_time or None,
+            "end_time": end_time or None,
+            "node_id": node_id or None,
+        }
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=1000).execute(EXPORT_QUERY, params)
 
-        if node_id:
-            query += " AND node_id = :node_id"
-            params["node_id"] = node_id
+            for row in result.mappings():
+                yield _row_to_dict(row)
 
-        query += " ORDER BY timestamp ASC"
+    def iter_export_rows(self, start_time: Optional[str] = None, end_time: Optional[str] = None, node_id: Optional[str] = None) -> Iterator[list[tuple]]:
+        """
+        Yield export rows as plain tuples, one server-side cursor batch at a time.
+
+        Feeds csv.writer.writerows directly, skipping the per-row dict and
+        the DictWriter lookups that iter_export_data would need.
+
+        Args:
+            start_time: Optional inclusive start of the range.
+            end_time: Optional inclusive end of the range.
+            node_id: Optional node to restrict the export to.
+
+        Yields:
+            Lists of (node_id, timestamp, temperature, relative_humidity,
+            soil_moisture, lux, voltage) tuples in ascending timestamp order,
+            with the timestamp as an ISO string.
+        """
+        params = {
+            "start_time": start_time or None,
+            "end_time": end_time or None,
+            "node_id": node_id or None,
+        }
 
         with self.engine.connect() as conn:
-            result = conn.execute(text(query), params)
-
-            data = []
-            for row in result:
-                data.append({
-                    "node_id": row[0],
-                    "timestamp": row[1].isoformat() if row[1] else None,
-                    "temperature": float(row[2]) if row[2] is not None else None,
-                    "relative_humidity": float(row[3]) if row[3] is not None else None,
-                    "soil_moisture": float(row[4]) if row[4] is not None else None,
-                    "lux": float(row[5]) if row[5] is not None else None,
-                    "voltage": float(row[6]) if row[6] is not None else None
-                })
-
-            return data
+            result = conn.execution_options(stream_results=True, yield_per=1000).execute(EXPORT_QUERY, params)
+
+            for partition in result.partitions():
+                yield [(row[0], row[1].isoformat(), *row[2:]) for row in partition]
+
+    def listen_for_readings(self, timeout: float = 15.0) -> Iterator[Optional[str]]:
+        """
+        Wait for new readings pushed by the sensor_db NOTIFY trigger.
+
+        Every caller in the process shares one LISTEN connection (see
+        _notify_loop), so N streaming clients hold one database connection
+        between them instead of one each.
+
+        Args:
+            timeout: Seconds to wait for a notification before yielding None.
+
+        Yields:
+            JSON payload of each new reading, or None when the wait timed out.
+        """
+        subscriber: Queue[str] = Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._subscribers_lock:
+            self._subscribers.add(subscriber)
+            if self._notify_thread is None or not self._notify_thread.is_alive():
+                self._notify_thread = threading.Thread(target=self._notify_loop, daemon=True)
+                self._notify_thread.start()
+
+        try:
+            while True:
+                try:
+                    yield subscriber.get(timeout=timeout)
+                except Empty:
+                    yield None
+        finally:
+            with self._subscribers_lock:
+                self._subscribers.discard(subscriber)
+
+    def _notify_loop(self) -> None:
+        """
+        Hold the process's LISTEN connection and copy each payload to every subscriber.
+
+        Uses a dedicated (non-pooled) connection in autocommit mode so the
+        LISTEN stays active; reconnects after errors.
+        """
+        while True:
+            try:
+                conn = psycopg2.connect(self.db_url)
+                try:
+                    conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                    with conn.cursor() as cur:
+                        cur.execute(f"LISTEN {NOTIFY_CHANNEL};")
+
+                    while True:
+                        if select.select([conn], [], [], 60) == ([], [], []):
+                            continue
+
+                        conn.poll()
+                        while conn.notifies:
+                            payload = conn.notifies.pop(0).payload
+                            with self._subscribers_lock:
+                                subscribers = list(self._subscribers)
+                            for subscriber in subscribers:
+                                try:
+                                    subscriber.put_nowait(payload)
+                                except Full:
+                                    # Client isn't reading; drop rather than block the others
+                                    pass
+                finally:
+                    conn.close()
+            except Exception:
+                logger.exception("Reading listener failed, reconnecting")
+                time.sleep(3)
 
     # ==================== Decision Management ====================
 
@@ -241,32 +420,37 @@ class DataAPI:
             List of decision dictionaries.
         """
         try:
-            if not os.path.exists(self.decisions_file):
+            try:
+                st = os.stat(self.decisions_file)
+            except FileNotFoundError:
                 return []
 
-            with open(self.decisions_file, 'r') as f:
-                content = f.read()
-                data = json.loads(content)
+            signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+            cached_signature, decisions = self._decisions_cache
+
+            # Only re-read and re-sort the file when it has changed
+            if signature != cached_signature:
+                with open(self.decisions_file, 'rb') as f:
+                    data = orjson.loads(f.read())
 
-            # Handle both dict (new format) and list (legacy format)
-            if isinstance(data, dict):
-                decisions = list(data.values())
-            else:
-                decisions = data
+                # Handle both dict (new format) and list (legacy format)
+                if isinstance(data, dict):
+                    decisions = list(data.values())
+                else:
+                    decisions = data
 
-            # Sort by timestamp (most recent first)
-            decisions.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+                # Sort by timestamp (most recent first)
+                decisions.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+                self._decisions_cache = (signature, decisions)
 
-            # Apply limit if specified
+            # Apply limit if specified (slicing also keeps the cached list private)
             if limit:
-                decisions = decisions[:limit]
+                return decisions[:limit]
 
-            return decisions
+            return decisions[:]
 
-        except Exception as e:
-            print(f"[ERROR] Error reading decisions: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error reading decisions")
             raise
 
     def clear_decisions(self) -> int:
@@ -283,17 +467,21 @@ class DataAPI:
             # Count existing decisions
             count = 0
             if os.path.exists(self.decisions_file):
-                with open(self.decisions_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.decisions_file, 'rb') as f:
+                    data = orjson.loads(f.read())
                     # Handle both dict and list formats
                     count = len(data) if data else 0
 
-            # Clear the file (use dict format)
-            with open(self.decisions_file, 'w') as f:
-                json.dump({}, f)
+            # Clear the file (use dict format), swapping in a new file so the
+            # collector never reads it half-written (see DecisionStorage._write)
+            tmp_path = self.decisions_file + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps({}))
+            os.replace(tmp_path, self.decisions_file)
+            self._decisions_cache = (None, [])
 
             return count
 
-        except Exception as e:
-            print(f"[ERROR] Error clearing decisions: {e}")
+        except Exception:
+            logger.exception("Error clearing decisions")
             raise
@@ -5,10 +5,13 @@ This module provides centralized access to node location and metadata,
 used by the weather service, heat map, and all location-based features.
 """
 
-import json
+import logging
+import orjson
 from pathlib import Path
 from typing import Optional, Any
 
+logger = logging.getLogger(__name__)
+
 
 def get_config_path() -> Path:
     """
@@ -22,35 +25,65 @@ def get_config_path() -> Path:
     return project_root / 'config' / 'nodes.json'
 
 
+# ((mtime_ns, size, inode) of nodes.json, parsed nodes, {node_id: node})
+# from the last load; a changed signature means the file was edited and is
+# parsed again
+_node_config_cache: tuple[
+    Optional[tuple[int, int, int]], list[dict[str, Any]], dict[str, dict[str, Any]]
+] = (None, [], {})
+
+
+def _index_nodes(nodes: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Map node_id to node, keeping the first entry for a repeated ID."""
+    index: dict[str, dict[str, Any]] = {}
+    for node in nodes:
+        if isinstance(node, dict) and 'node_id' in node:
+            index.setdefault(node['node_id'], node)
+    return index
+
+
 def load_node_config() -> list[dict[str, Any]]:
     """
     Load node configuration from config/nodes.json.
 
+    The parsed list is cached until the file changes, so repeated calls
+    cost a single stat(). Callers share the cached list and must not
+    modify it.
+
     Returns:
         List of node dictionaries with location and metadata.
         Returns empty list if file doesn't exist or can't be parsed.
     """
+    global _node_config_cache
     config_path = get_config_path()
 
     try:
-        if not config_path.exists():
-            print(f"[WARNING] Node config file not found: {config_path}")
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError:
+            logger.warning("Node config file not found: %s", config_path)
             return []
 
-        with open(config_path, 'r') as f:
-            nodes = json.load(f)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        cached_signature, cached_nodes, _ = _node_config_cache
+        if signature == cached_signature:
+            return cached_nodes
+
+        with open(config_path, 'rb') as f:
+            nodes = orjson.loads(f.read())
 
         if not isinstance(nodes, list):
-            print(f"[WARNING] Node config should be a list, got {type(nodes)}")
+            logger.warning("Node config should be a list, got %s", type(nodes))
             return []
 
+        _node_config_cache = (signature, nodes, _index_nodes(nodes))
         return nodes
 
-    except json.JSONDecodeError as e:
-        print(f"[ERROR] Failed to parse node config: {e}")
+    except orjson.JSONDecodeError as e:
+        logger.error("Failed to parse node config: %s", e)
         return []
-    except Exception as e:
-        print(f"[ERROR] Failed to load node config: {e}")
+    except Exception:
+        logger.exception("Failed to load node config")
         return []
 
 
@@ -67,6 +100,11 @@ def get_node_location(node_id: str) -> Optional[dict[str, Any]]:
     """
     nodes = load_node_config()
 
+    _, cached_nodes, index = _node_config_cache
+    if nodes is cached_nodes:
+        return index.get(node_id)
+
+    # Load failed, or another thread reloaded the file in between
     for node in nodes:
         if node.get('node_id') == node_id:
             return node
@@ -98,17 +136,15 @@ def validate_node_config() -> tuple[bool, list[str]]:
     """
     errors = []
 
-    # Check file exists
-    config_path = get_config_path()
-    if not config_path.exists():
-        errors.append(f"Config file not found: {config_path}")
-        return (False, errors)
-
-    # Load and validate structure
+    # Load and validate structure (a single load; served from the cache when unchanged)
     try:
         nodes = load_node_config()
         if not nodes:
-            errors.append("Config file is empty or invalid")
+            config_path = get_config_path()
+            if not config_path.exists():
+                errors.append(f"Config file not found: {config_path}")
+            else:
+                errors.append("Config file is empty or invalid")
             return (False, errors)
 
         # Validate each node
@@ -0,0 +1,148 @@
+"""
+Tests for BatchingWriter flushing, backpressure and shutdown.
+
+Uses an in-memory stand-in for TimescaleStorage, so no database is needed.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import pytest
+
+import collector.batching_writer as batching_writer
+from collector.batching_writer import BatchingWriter
+
+
+class FakeStorage:
+    """Records every batch passed to upsert_many; can hold a flush until released."""
+
+    def __init__(self, block: bool = False, failures: int = 0):
+        self.batches: list[list[dict]] = []
+        self.failures = failures
+        self.attempts = 0
+        self.flush_started = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def upsert_many(self, readings):
+        self.flush_started.set()
+        self.release.wait()
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError("database unavailable")
+        self.batches.append(list(readings))
+        return len(readings)
+
+
+def reading(i: int) -> dict:
+    return {"node_id": f"!node{i}", "timestamp": "2024-01-01 00:00", "voltage": 3.7}
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    """Poll condition() until it is true or timeout seconds pass."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_flushes_when_max_rows_buffered():
+    storage = FakeStorage()
+    writer = BatchingWriter(storage, max_rows=3, max_latency_ms=60_000)
+    try:
+        writer.save_many([reading(i) for i in range(3)])
+        assert wait_for(lambda: len(storage.batches) == 1)
+        assert [r["node_id"] for r in storage.batches[0]] == ["!node0", "!node1", "!node2"]
+    finally:
+        writer.close()
+
+
+def test_flushes_partial_batch_after_max_latency():
+    storage = FakeStorage()
+    writer = BatchingWriter(storage, max_rows=100, max_latency_ms=50)
+    try:
+        start = time.monotonic()
+        writer.save(reading(0))
+        assert wait_for(lambda: len(storage.batches) == 1)
+        assert time.monotonic() - start >= 0.04
+        assert storage.batches[0] == [reading(0)]
+    finally:
+        writer.close()
+
+
+def test_save_blocks_while_buffer_is_full():
+    storage = FakeStorage(block=True)
+    writer = BatchingWriter(storage, max_rows=1, max_latency_ms=10, max_buffered_rows=2)
+    try:
+        # First reading is taken by the flush thread, which then blocks in storage
+        writer.save(reading(0))
+        assert storage.flush_started.wait(2.0)
+
+        # These two fill the buffer while the flush is stuck
+        writer.save(reading(1))
+        writer.save(reading(2))
+
+        blocked = threading.Thread(target=writer.save, args=(reading(3),))
+        blocked.start()
+        blocked.join(0.2)
+        assert blocked.is_alive(), "save() should wait for room in the buffer"
+
+        storage.release.set()
+        blocked.join(2.0)
+        assert not blocked.is_alive()
+    finally:
+        storage.release.set()
+        writer.close()
+
+    saved = [r["node_id"] for batch in storage.batches for r in batch]
+    assert saved == ["!node0", "!node1", "!node2", "!node3"]
+
+
+def test_close_flushes_buffered_readings():
+    storage = FakeStorage()
+    writer = BatchingWriter(storage, max_rows=100, max_latency_ms=60_000)
+    writer.save_many([reading(i) for i in range(5)])
+    writer.close()
+
+    assert sum(len(batch) for batch in storage.batches) == 5
+
+    with pytest.raises(RuntimeError):
+        writer.save(reading(5))
+
+
+def test_failed_batch_is_retried_in_order(monkeypatch):
+    monkeypatch.setattr(batching_writer, "RETRY_INITIAL_SECONDS", 0.01)
+    storage = FakeStorage(failures=2)
+    writer = BatchingWriter(storage, max_rows=2, max_latency_ms=10)
+    try:
+        writer.save_many([reading(0), reading(1)])
+        assert wait_for(lambda: storage.batches)
+        writer.save(reading(2))
+    finally:
+        writer.close()
+
+    assert storage.attempts >= 3
+    saved = [r["node_id"] for batch in storage.batches for r in batch]
+    assert saved == ["!node0", "!node1", "!node2"]
+
+
+def test_close_gives_up_after_one_final_attempt(monkeypatch):
+    monkeypatch.setattr(batching_writer, "RETRY_INITIAL_SECONDS", 60)
+    storage = FakeStorage(failures=1_000)
+    writer = BatchingWriter(storage, max_rows=1, max_latency_ms=10)
+    writer.save(reading(0))
+    assert wait_for(lambda: storage.attempts == 1)
+
+    # close() interrupts the 60s backoff instead of waiting it out
+    start = time.monotonic()
+    writer.close()
+
+    assert time.monotonic() - start < 2
+    assert storage.attempts == 2
+    assert storage.batches == []
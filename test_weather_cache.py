@@ -0,0 +1,182 @@
+"""
+Tests for WeatherCache LRU eviction, TTL expiry and file persistence.
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+import pytest
+
+import models.weather_service as weather_service
+from models.weather_service import WeatherCache, WeatherForecast
+
+
+def forecast(node_id: str) -> WeatherForecast:
+    return WeatherForecast(
+        node_id=node_id,
+        location_name="Test",
+        lat=41.7,
+        lon=-86.2,
+        timestamp="2024-01-01T10:00:00",
+        forecast_hours=24,
+        precipitation_expected=False,
+        precipitation_probability=0.1,
+        precipitation_amount_mm=0.0,
+        precipitation_types=[],
+        temperature_avg=20.0,
+        description="clear sky",
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic() for the weather_service module."""
+    now = [1000.0]
+    monkeypatch.setattr(weather_service.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_evicts_least_recently_used_entry():
+    cache = WeatherCache(duration_minutes=30, max_entries=2)
+    cache.set("a", forecast("a"))
+    cache.set("b", forecast("b"))
+
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a").node_id == "a"
+    cache.set("c", forecast("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_refreshing_a_key_does_not_evict(clock):
+    cache = WeatherCache(duration_minutes=30, max_entries=2)
+    cache.set("a", forecast("a"))
+    cache.set("b", forecast("b"))
+    cache.set("a", forecast("a"))
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is not None
+
+
+def test_entries_expire_after_duration(clock):
+    cache = WeatherCache(duration_minutes=1, max_entries=10)
+    cache.set("a", forecast("a"))
+
+    clock[0] += 59
+    assert cache.get("a") is not None
+
+    clock[0] += 2
+    assert cache.get("a") is None
+
+
+def test_set_purges_every_expired_entry(clock):
+    cache = WeatherCache(duration_minutes=1, max_entries=10)
+    cache.set("a", forecast("a"))
+    cache.set("b", forecast("b"))
+
+    clock[0] += 61
+    cache.set("c", forecast("c"))
+
+    assert list(cache._cache) == ["c"]
+
+
+def test_refreshed_entry_outlives_its_first_expiry(clock):
+    cache = WeatherCache(duration_minutes=1, max_entries=10)
+    cache.set("a", forecast("a"))
+
+    clock[0] += 30
+    cache.set("a", forecast("a"))
+
+    # The heap still holds the first (now superseded) expiry for "a"
+    clock[0] += 40
+    cache.set("b", forecast("b"))
+    assert cache.get("a") is not None
+
+
+def test_flush_persists_and_reloads(tmp_path):
+    path = tmp_path / "weather_cache.json"
+    cache = WeatherCache(duration_minutes=30, max_entries=10, file_path=str(path))
+    cache.set("a", forecast("a"))
+    cache.flush()
+
+    reloaded = WeatherCache(duration_minutes=30, max_entries=10, file_path=str(path))
+
+    assert reloaded.get("a") == forecast("a")
+
+
+def test_set_writes_at_most_once_per_interval(tmp_path, monkeypatch):
+    path = tmp_path / "weather_cache.json"
+    cache = WeatherCache(duration_minutes=30, max_entries=10, file_path=str(path))
+
+    cache.set("a", forecast("a"))
+    assert not path.exists()
+
+    monkeypatch.setattr(weather_service, "SAVE_INTERVAL_SECONDS", 0)
+    cache.set("b", forecast("b"))
+    assert path.exists()
+
+
+def test_expired_entries_are_not_reloaded(tmp_path, monkeypatch):
+    path = tmp_path / "weather_cache.json"
+    cache = WeatherCache(duration_minutes=1, max_entries=10, file_path=str(path))
+    cache.set("a", forecast("a"))
+    cache.flush()
+
+    # Two minutes later by the wall clock the saved entry is stale
+    real_time = weather_service.time.time
+    monkeypatch.setattr(weather_service.time, "time", lambda: real_time() + 120)
+    reloaded = WeatherCache(duration_minutes=1, max_entries=10, file_path=str(path))
+
+    assert reloaded.get("a") is None
+
+
+def test_clear_is_persisted_immediately(tmp_path):
+    path = tmp_path / "weather_cache.json"
+    cache = WeatherCache(duration_minutes=30, max_entries=10, file_path=str(path))
+    cache.set("a", forecast("a"))
+    cache.flush()
+
+    assert cache.clear() == 1
+
+    reloaded = WeatherCache(duration_minutes=30, max_entries=10, file_path=str(path))
+    assert reloaded.get("a") is None
+
+
+def test_load_skips_malformed_entries(tmp_path):
+    path = tmp_path / "weather_cache.json"
+    good = {"timestamp": weather_service.time.time(), "forecast": forecast("a").to_dict()}
+    path.write_bytes(weather_service.orjson.dumps({
+        "a": good,
+        "b": ["not", "an", "entry"],
+        "c": {"timestamp": "yesterday", "forecast": forecast("c").to_dict()},
+        "d": {"timestamp": good["timestamp"], "forecast": {"node_id": "d"}},
+    }))
+
+    cache = WeatherCache(duration_minutes=30, max_entries=10, file_path=str(path))
+
+    assert list(cache._cache) == ["a"]
+
+
+def test_load_ignores_a_non_object_file(tmp_path):
+    path = tmp_path / "weather_cache.json"
+    path.write_bytes(b"[1, 2, 3]")
+
+    cache = WeatherCache(duration_minutes=30, max_entries=10, file_path=str(path))
+
+    assert len(cache._cache) == 0
+
+
+def test_load_keeps_the_newest_max_entries(tmp_path):
+    path = tmp_path / "weather_cache.json"
+    now = weather_service.time.time()
+    path.write_bytes(weather_service.orjson.dumps({
+        key: {"timestamp": now - age, "forecast": forecast(key).to_dict()}
+        for key, age in [("old", 30), ("newest", 10), ("middle", 20)]
+    }))
+
+    cache = WeatherCache(duration_minutes=30, max_entries=2, file_path=str(path))
+
+    assert list(cache._cache) == ["middle", "newest"]